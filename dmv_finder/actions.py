@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+import logging
+from typing import List, Optional, Tuple
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -7,8 +7,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-from .config import SELECTORS, DMV_URL
+from .artifacts import capture_failure
+from .config import SELECTORS, DMV_URL, CAPTURE_CORPUS
 from .core import random_delay, human_type
+from .corpus import capture_page, KIND_CALENDAR, KIND_OFFICE_LIST
+from .fingerprint import page_fingerprint, OFFICE_LIST_FINGERPRINT_JS, CALENDAR_FINGERPRINT_JS
+from .log import html_log, sample_html_context
+from .parsing import AVAILABLE_LABELS, format_calendar_date, normalize_text, parse_calendar_slots_html
+
+log = logging.getLogger(__name__)
 
 # ============================================================================
 # EPIC-2: LOGIN FLOW
@@ -16,7 +23,7 @@ from .core import random_delay, human_type
 
 def perform_login(driver: webdriver.Chrome, params: dict) -> bool:
     """Perform the login flow on DMV website."""
-    print("🔐 Starting login flow...")
+    log.info("🔐 Starting login flow...")
     
     try:
         # Navigate to DMV page
@@ -26,37 +33,39 @@ def perform_login(driver: webdriver.Chrome, params: dict) -> bool:
         wait = WebDriverWait(driver, 15)
         
         # Action 1: Click appointment type
-        print("  → Clicking appointment type...")
+        log.info("  → Clicking appointment type...")
         appt_type = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SELECTORS["appointment_type"])))
         appt_type.click()
         random_delay()
         
         # Action 2: Input Permit Number
-        print("  → Entering permit number...")
+        log.info("  → Entering permit number...")
         permit_input = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS["permit_number"])))
         human_type(permit_input, params["permit_number"])
         random_delay(1, 2)
         
         # Action 3: Input DOB
-        print("  → Entering date of birth...")
+        log.info("  → Entering date of birth...")
         dob_input = driver.find_element(By.CSS_SELECTOR, SELECTORS["dob"])
         human_type(dob_input, params["dob"])
         random_delay(1, 2)
         
         # Action 4: Click Submit
-        print("  → Submitting form...")
+        log.info("  → Submitting form...")
         submit_btn = driver.find_element(By.CSS_SELECTOR, SELECTORS["submit_btn"])
         submit_btn.click()
         random_delay(3, 5)
         
-        print("✅ Login flow completed!")
+        log.info("✅ Login flow completed!")
         return True
         
     except TimeoutException as e:
-        print(f"❌ Login failed: Timeout waiting for element - {e}")
+        log.error("❌ Login failed: Timeout waiting for element - %s", e)
+        capture_failure(driver, "login", e)
         return False
     except NoSuchElementException as e:
-        print(f"❌ Login failed: Element not found - {e}")
+        log.error("❌ Login failed: Element not found - %s", e)
+        capture_failure(driver, "login", e)
         return False
 
 
@@ -66,22 +75,23 @@ def perform_login(driver: webdriver.Chrome, params: dict) -> bool:
 
 def verify_office_page(driver: webdriver.Chrome) -> bool:
     """Verify we're on the office selection page."""
-    print("🔍 Verifying office selection page...")
+    log.info("🔍 Verifying office selection page...")
     
     try:
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Which office would you like to visit?')]"))
         )
-        print("✅ Office selection page verified!")
+        log.info("✅ Office selection page verified!")
         return True
-    except TimeoutException:
-        print("❌ ALERT: 'Which office would you like to visit?' text NOT found!")
+    except TimeoutException as e:
+        log.error("❌ ALERT: 'Which office would you like to visit?' text NOT found!")
+        capture_failure(driver, "verify_office_page", e)
         return False
 
 
 def search_office(driver: webdriver.Chrome, zip_code: str) -> bool:
     """Search for offices near a zip code."""
-    print(f"🔎 Searching offices near zip code: {zip_code}")
+    log.info("🔎 Searching offices near zip code: %s", zip_code)
     
     try:
         wait = WebDriverWait(driver, 10)
@@ -101,7 +111,8 @@ def search_office(driver: webdriver.Chrome, zip_code: str) -> bool:
         return True
         
     except Exception as e:
-        print(f"❌ Office search failed: {e}")
+        log.error("❌ Office search failed: %s", e)
+        capture_failure(driver, "search_office", e)
         return False
 
 
@@ -109,20 +120,54 @@ def search_office(driver: webdriver.Chrome, zip_code: str) -> bool:
 # EPIC-4: OFFICE SELECTION
 # ============================================================================
 
+def read_office_list(driver: webdriver.Chrome) -> list:
+    """Return the normalized text of each office in the result list."""
+    items = driver.find_elements(By.CSS_SELECTOR, f"{SELECTORS['office_list']} > li")
+    return [normalize_text(item.get_attribute("textContent") or "") for item in items]
+
+
+def fingerprint_office_list(driver: webdriver.Chrome) -> Optional[str]:
+    """Wait for the result list and return its in-page fingerprint (None if it doesn't load)."""
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, f"{SELECTORS['office_list']} > li"))
+        )
+    except TimeoutException:
+        return None
+    return page_fingerprint(driver, OFFICE_LIST_FINGERPRINT_JS, SELECTORS["office_list"])
+
+
+def read_first_office_name(driver: webdriver.Chrome) -> str:
+    """Wait for the result list and return the first office's text ('' if it doesn't load)."""
+    try:
+        first_item = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, f"{SELECTORS['office_list']} > li:nth-child(1)"))
+        )
+        return normalize_text(first_item.get_attribute("textContent") or "")
+    except Exception as e:
+        log.warning("  ⚠ Could not read office name: %s", e)
+        return ""
+
+
 def select_first_office(driver: webdriver.Chrome) -> bool:
     """Select the first office in the result list."""
-    print("🏢 Selecting first office...")
+    log.info("🏢 Selecting first office...")
     
     try:
         wait = WebDriverWait(driver, 10)
         first_office_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SELECTORS["first_office"])))
+        
+        if CAPTURE_CORPUS:
+            capture_page(driver, KIND_OFFICE_LIST, expected=read_office_list(driver))
+        
         first_office_btn.click()
         random_delay(3, 5)
-        print("✅ First office selected!")
+        log.info("✅ First office selected!")
         return True
         
     except Exception as e:
-        print(f"❌ Office selection failed: {e}")
+        log.error("❌ Office selection failed: %s", e)
+        capture_failure(driver, "select_first_office", e)
         return False
 
 
@@ -130,38 +175,90 @@ def select_first_office(driver: webdriver.Chrome) -> bool:
 # EPIC-5: DATE COMPARISON LOGIC
 # ============================================================================
 
-def parse_calendar_date(driver: webdriver.Chrome) -> Optional[str]:
+def read_calendar_dates(driver: webdriver.Chrome) -> Tuple[List[str], bool]:
     """
-    Read the calendar using specific selectors to find 'Open Times' and parse the date.
-    Selector path: #appointments__date-cal ... .rbc-row-content > div
-    Target: div.rbc-row-segment > span.rbc-event-available ("Open Times")
-    Sibling: span.rbc-event-day-num--mobile (Date text: "Month Day, Year")
+    Read every open date (MM/DD/YYYY) on the calendar from one page_source snapshot.
+    Returns (dates, ok): dates is empty when no slot is open; ok is False when the calendar
+    couldn't be read in full. If the snapshot can't be parsed, falls back to scanning the
+    segments over WebDriver, which only finds the first open date (ok is False then too).
     """
-    print("📅 Reading calendar...")
+    log.info("📅 Reading calendar...")
     
     # CRITICAL: Verify we're on the calendar page before attempting to parse
     current_url = driver.current_url
     if "appointments/select-date" not in current_url:
-        print(f"  ❌ ERROR: Not on calendar page! Current URL: {current_url}")
-        print(f"  Expected URL to contain: 'appointments/select-date'")
-        return None
+        log.error("  ❌ ERROR: Not on calendar page! Current URL: %s", current_url)
+        log.error("  Expected URL to contain: 'appointments/select-date'")
+        capture_failure(driver, "calendar_url")
+        return [], False
+    
+    if not _wait_for_calendar(driver):
+        return [], False
     
     try:
-        wait = WebDriverWait(driver, 5) # Short wait
-        
-        # 1. Wait for at least one segment to appear to ensure calendar is loaded
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".rbc-row-segment")))
-        except TimeoutException:
-            print("  ⚠ No calendar rows found (timeout). Saving HTML for debug...")
-            with open("debug_page_source.html", "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
-            print("  📂 Full page HTML saved to 'debug_page_source.html'")
-            return None
+        page_source = driver.page_source
+        dates = parse_calendar_slots_html(page_source)
+    except Exception as e:
+        log.warning("  ⚠ Could not parse calendar snapshot (%s), scanning segments instead", e)
+        found_date, _ = _find_first_open_date(driver)
+        return ([found_date] if found_date else []), False
+    
+    if dates:
+        log.info("  → Parsed %d open date(s), first %s", len(dates), dates[0])
+    else:
+        log.warning("  ⚠ No valid 'Open Times' slots found on the calendar.")
+    
+    if CAPTURE_CORPUS:
+        capture_page(driver, KIND_CALENDAR, page_source=page_source,
+                     expected=dates[0] if dates else None, month=read_calendar_label(driver))
+    
+    return dates, True
+
+
+def fingerprint_calendar(driver: webdriver.Chrome) -> Optional[str]:
+    """Wait briefly for the calendar and return its in-page fingerprint (None if it doesn't load)."""
+    if "appointments/select-date" not in driver.current_url:
+        return None
+    try:
+        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".rbc-row-segment")))
+    except TimeoutException:
+        return None
+    return page_fingerprint(driver, CALENDAR_FINGERPRINT_JS, SELECTORS["calendar_label"])
+
+
+def read_calendar_label(driver: webdriver.Chrome) -> str:
+    """Return the calendar toolbar label (e.g. 'January 2026'), or '' if missing."""
+    try:
+        labels = driver.find_elements(By.CSS_SELECTOR, SELECTORS["calendar_label"])
+        return normalize_text(labels[0].get_attribute("textContent") or "") if labels else ""
+    except Exception:
+        return ""
+
+
+def _wait_for_calendar(driver: webdriver.Chrome) -> bool:
+    """Wait for at least one segment to appear to ensure calendar is loaded."""
+    try:
+        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".rbc-row-segment")))
+        return True
+    except TimeoutException as e:
+        log.warning("  ⚠ No calendar rows found (timeout). Saving page for debug...")
+        capture_failure(driver, "calendar_timeout", e)
+        return False
+
 
-        # 2. Find all row segments
+def _find_first_open_date(driver: webdriver.Chrome) -> Tuple[Optional[str], bool]:
+    """
+    Fallback for read_calendar_dates: scan the calendar segments one WebDriver call at a time
+    and return (first open date as MM/DD/YYYY, ok).
+    Selector path: #appointments__date-cal ... .rbc-row-content > div
+    Target: div.rbc-row-segment > span.rbc-event-available ("Open Times")
+    Sibling: span.rbc-event-day-num--mobile (Date text: "Month Day, Year")
+    (None, True) means the calendar loaded with no open slot; ok is False on errors.
+    """
+    try:
+        # Find all row segments
         row_segments = driver.find_elements(By.CSS_SELECTOR, ".rbc-row-segment")
-        print(f"  → Found {len(row_segments)} calendar segments. Checking each...")
+        log.info("  → Found %s calendar segments. Checking each...", len(row_segments))
         
         for i, segment in enumerate(row_segments):
             try:
@@ -174,55 +271,55 @@ def parse_calendar_date(driver: webdriver.Chrome) -> Optional[str]:
                     text_content = open_times_span[0].get_attribute("textContent").strip()
                     # print(f"    Segment {i}: Found status '{text_content}'") # verbose debug
                     
-                    if text_content in ["Open Times", "Nearby Office Times"]:
-                        print(f"  ✨ Found '{text_content}' slot at segment {i}!")
+                    if text_content in AVAILABLE_LABELS:
+                        log.info("  ✨ Found '%s' slot at segment %s!", text_content, i)
                         
-                        # DEBUG: Log the HTML parsing context
-                        try:
-                            html_content = segment.get_attribute('outerHTML')
-                            print(f"  🔍 HTML Context: {html_content}")
-                        except Exception:
-                            pass
+                        # DEBUG: Log the HTML parsing context (sampled, separate channel)
+                        if sample_html_context():
+                            try:
+                                html_log.debug("🔍 HTML Context: %s", segment.get_attribute('outerHTML'))
+                            except Exception:
+                                pass
                         
                         # Found a slot! Now find the date.
                         date_span = segment.find_elements(By.CSS_SELECTOR, "span.rbc-event-day-num--mobile")
                         if date_span:
                             # Use textContent because the element might be hidden on desktop view
                             date_text = date_span[0].get_attribute("textContent").strip()
-                            print(f"  → Date text found: '{date_text}'")
+                            log.info("  → Date text found: '%s'", date_text)
                             
                             # Convert to MM/DD/YYYY
-                            try:
-                                date_obj = datetime.strptime(date_text, "%B %d, %Y")
-                                formatted_date = date_obj.strftime("%m/%d/%Y")
-                                print(f"  → Parsed date: {formatted_date}")
-                                return formatted_date
-                            except ValueError as ve:
-                                print(f"  ❌ Date parsing error for '{date_text}': {ve}")
-                                # CONTINUE searching! Do not return None.
+                            formatted_date = format_calendar_date(date_text)
+                            if formatted_date:
+                                log.info("  → Parsed date: %s", formatted_date)
+                                return formatted_date, True
+                            log.error("  ❌ Date parsing error for '%s'", date_text)
+                            # CONTINUE searching! Do not return None.
                         else:
-                            print("  ⚠ 'Open Times' found but NO date span sibling?")
+                            log.warning("  ⚠ 'Open Times' found but NO date span sibling?")
             
             except Exception as inner_e:
-                print(f"  ⚠ Error checking segment {i}: {inner_e}")
+                log.warning("  ⚠ Error checking segment %s: %s", i, inner_e)
                 continue
         
-        print("  ⚠ No valid 'Open Times' slots found after checking all segments.")
-        return None
+        log.warning("  ⚠ No valid 'Open Times' slots found after checking all segments.")
+        return None, True
             
     except Exception as e:
-        print(f"❌ Calendar parsing failed: {e}")
-        return None
+        log.error("❌ Calendar parsing failed: %s", e)
+        capture_failure(driver, "parse_calendar", e)
+        return None, False
 
 
 def click_back_reset(driver: webdriver.Chrome) -> bool:
     """Click the back/reset button to return to office search."""
-    print("🔙 Going back to office search...")
+    log.info("🔙 Going back to office search...")
     
     try:
         wait = WebDriverWait(driver, 10)
         # Try to find the button
         back_btn = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS["back_btn"])))
+        href = back_btn.get_attribute("href")
         
         # In headless, complex interactions (hover, scroll) sometimes crash chrome on specific sites.
         # We will try a robust JS click directly.
@@ -230,14 +327,25 @@ def click_back_reset(driver: webdriver.Chrome) -> bool:
             driver.execute_script("arguments[0].click();", back_btn)
         except Exception:
             # Fallback: try standard click
-             back_btn.click()
+            back_btn.click()
+        
+        # Confirm we're back on the office search; headless sometimes swallows the click
+        try:
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS["zip_input"])))
+        except TimeoutException:
+            if not href:
+                raise
+            log.warning("  ⚠ Back click didn't reach office search. Opening the link directly...")
+            driver.get(href)
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS["zip_input"])))
             
         random_delay(2, 4)
-        print("✅ Returned to office search!")
+        log.info("✅ Returned to office search!")
         return True
         
     except Exception as e:
-        print(f"❌ Back/reset failed: {e}")
+        log.error("❌ Back/reset failed: %s", e)
+        capture_failure(driver, "back_reset", e)
         # Don't return False immediately if we suspect the driver crashed, let the exception bubble up later
         # But here we just log.
         return False
@@ -0,0 +1,250 @@
+"""
+Debug artifact store.
+
+On every step failure, capture_failure() grabs the page source, a screenshot
+and the browser console log from the driver, then hands them to a background
+writer thread which compresses and stores them as
+
+    artifacts/<YYYYMMDD>-<cycle_id>/<zip>/<HHMMSS>-<step>.html.gz     (zip is "no-zip" outside a zip)
+                                          <HHMMSS>-<step>.png
+                                          <HHMMSS>-<step>.console.json.gz
+    artifacts/index.jsonl   - one line per failure (cycle, zip, step, error, files)
+
+After each write, artifacts (and index entries) older than
+ARTIFACT_MAX_AGE_DAYS are deleted, then the oldest ones until the store,
+index included, fits in ARTIFACT_MAX_BYTES.
+
+Only the WebDriver calls happen on the scanning thread; compression and disk
+I/O never block the scan.
+
+The permit number and date of birth inputs are blanked in the page before
+anything is captured (if that fails, no page source or screenshot is kept),
+so the login form never ends up on disk.
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .config import ARTIFACT_DIR, ARTIFACT_MAX_BYTES, ARTIFACT_MAX_AGE_DAYS, SELECTORS
+from .log import cycle_id_var, zip_code_var
+
+log = logging.getLogger(__name__)
+
+INDEX_NAME = "index.jsonl"
+
+# Inputs holding personal data, cleared before page source / screenshot are taken
+SENSITIVE_INPUTS = (SELECTORS["permit_number"], SELECTORS["dob"])
+
+# arguments[0]: selectors to blank
+_REDACT_JS = """
+for (const selector of arguments[0]) {
+    for (const input of document.querySelectorAll(selector)) {
+        input.value = '';
+        input.removeAttribute('value');
+    }
+}
+"""
+
+
+class ArtifactStore:
+    """Background writer for failure artifacts, with size and age eviction."""
+
+    def __init__(self, root: Path = ARTIFACT_DIR, max_bytes: int = ARTIFACT_MAX_BYTES,
+                 max_age_days: float = ARTIFACT_MAX_AGE_DAYS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------------
+    # Scanning thread
+    # ------------------------------------------------------------------------
+
+    def capture(self, driver, step: str, error: Optional[BaseException] = None) -> None:
+        """Collect artifacts from the driver and queue them for writing. Never raises."""
+        job = {
+            "captured_at": datetime.now(),
+            "cycle_id": cycle_id_var.get(),
+            "zip_code": zip_code_var.get(),
+            "step": step,
+            "error": f"{type(error).__name__}: {error}" if error else None,
+            "url": None,
+            "page_source": None,
+            "screenshot": None,
+            "console": None,
+        }
+        # Each call on its own: a crashed page may still give us some of them
+        try:
+            job["url"] = driver.current_url
+        except Exception:
+            pass
+        try:
+            driver.execute_script(_REDACT_JS, list(SENSITIVE_INPUTS))
+            redacted = True
+        except Exception:
+            redacted = False
+        if redacted:
+            try:
+                job["page_source"] = driver.page_source
+            except Exception:
+                pass
+            try:
+                job["screenshot"] = driver.get_screenshot_as_png()
+            except Exception:
+                pass
+        try:
+            job["console"] = driver.get_log("browser")
+        except Exception:
+            pass
+
+        self._queue.put(job)
+        log.info("  🧾 Queued debug artifacts for failed step '%s'", step)
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """Wait (up to timeout) for queued artifacts to be written."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    # ------------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._write(job)
+                self._evict()
+            except Exception as e:
+                log.warning("⚠ Could not store debug artifacts: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, job: dict) -> None:
+        captured_at = job["captured_at"]
+        zip_dir = job["zip_code"] if job["zip_code"] != "-" else "no-zip"
+        directory = self.root / f"{captured_at:%Y%m%d}-{job['cycle_id']}" / zip_dir
+        if job["page_source"] is not None or job["screenshot"] is not None or job["console"]:
+            directory.mkdir(parents=True, exist_ok=True)
+        else:
+            self.root.mkdir(parents=True, exist_ok=True)
+        stem = f"{captured_at:%H%M%S}-{job['step']}"
+
+        files = []
+        if job["page_source"] is not None:
+            path = directory / f"{stem}.html.gz"
+            with gzip.open(path, "wb") as f:
+                f.write(job["page_source"].encode("utf-8"))
+            files.append(path)
+        if job["screenshot"] is not None:
+            path = directory / f"{stem}.png"  # PNG is already compressed
+            path.write_bytes(job["screenshot"])
+            files.append(path)
+        if job["console"]:
+            path = directory / f"{stem}.console.json.gz"
+            with gzip.open(path, "wb") as f:
+                f.write(json.dumps(job["console"]).encode("utf-8"))
+            files.append(path)
+
+        entry = {
+            "captured_at": captured_at.isoformat(timespec="seconds"),
+            "cycle_id": job["cycle_id"],
+            "zip_code": job["zip_code"],
+            "step": job["step"],
+            "error": job["error"],
+            "url": job["url"],
+            "files": [str(path.relative_to(self.root)) for path in files],
+        }
+        with open(self.root / INDEX_NAME, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        if files:
+            log.info("  🧾 Debug artifacts saved to %s", directory)
+
+    def _evict(self) -> None:
+        """Drop cycle directories past the age limit, then the oldest until under the size cap."""
+        cycle_dirs = []
+        for path in self.root.iterdir():
+            if path.is_dir():
+                files = [f for f in path.rglob("*") if f.is_file()]
+                size = sum(f.stat().st_size for f in files)
+                newest = max((f.stat().st_mtime for f in files), default=path.stat().st_mtime)
+                cycle_dirs.append((newest, size, path))
+        cycle_dirs.sort()
+
+        index_path = self.root / INDEX_NAME
+        index_size = index_path.stat().st_size if index_path.exists() else 0
+        total = index_size + sum(size for _, size, _ in cycle_dirs)
+        now = time.time()
+        removed = set()
+        for newest, size, path in cycle_dirs:
+            if now - newest > self.max_age_seconds or total > self.max_bytes:
+                shutil.rmtree(path, ignore_errors=True)
+                removed.add(path.name)
+                total -= size
+
+        if removed:
+            log.debug("🧹 Evicted %s old artifact folder(s)", len(removed))
+        if index_size:
+            self._prune_index(removed, now - self.max_age_seconds, self.max_bytes - (total - index_size))
+
+    def _prune_index(self, removed_dirs: set, cutoff: float, max_bytes: int) -> None:
+        """
+        Drop index entries for removed folders or older than cutoff (epoch seconds), then the
+        oldest until the index fits in max_bytes. Rewritten through a temp file.
+        """
+        index_path = self.root / INDEX_NAME
+        lines = index_path.read_text(encoding="utf-8").splitlines()
+        kept = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                captured_at = datetime.fromisoformat(entry["captured_at"]).timestamp()
+            except (ValueError, KeyError):
+                continue  # a torn or foreign line
+            if captured_at < cutoff:
+                continue
+            if entry["files"] and Path(entry["files"][0]).parts[0] in removed_dirs:
+                continue
+            kept.append(line)
+
+        size = sum(len(line.encode("utf-8")) + 1 for line in kept)
+        while kept and size > max_bytes:
+            size -= len(kept.pop(0).encode("utf-8")) + 1
+
+        if len(kept) == len(lines):
+            return
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text("".join(f"{line}\n" for line in kept), encoding="utf-8")
+        tmp_path.replace(index_path)
+
+
+_store: Optional[ArtifactStore] = None
+
+
+def get_store() -> ArtifactStore:
+    """The process-wide store, started on first use."""
+    global _store
+    if _store is None:
+        _store = ArtifactStore()
+        atexit.register(_store.flush)
+    return _store
+
+
+def capture_failure(driver, step: str, error: Optional[BaseException] = None) -> None:
+    """Capture page source, screenshot and console log for a failed step. Never raises."""
+    try:
+        get_store().capture(driver, step, error)
+    except Exception as e:
+        log.warning("  ⚠ Could not capture debug artifacts: %s", e)
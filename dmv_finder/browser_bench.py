@@ -0,0 +1,142 @@
+"""
+Browser profile benchmark: headed vs. lean headless.
+
+For each profile, starts a browser, runs one real scan cycle and measures
+wall time, CPU seconds and peak RSS of the whole browser process tree
+(chromedriver + every Chrome process), sampled in the background.
+
+The cycle browses and reads every calendar like a normal run, but as a dry
+run: parameters.md, history and change stats are not written, zip codes are
+not recycled and no notifications are sent, so a date found during a
+benchmark is still reported by the next real scan. Needs psutil.
+
+Usage:
+    python3 main.py bench --browser [--runs N] [--profiles headed,headless]
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+log = logging.getLogger(__name__)
+
+PROFILES = ("headed", "headless")
+
+
+class ProcessTreeSampler:
+    """Samples CPU time and RSS of a process and all its descendants on a background thread."""
+
+    def __init__(self, root_pid: int, interval: float = 0.5):
+        import psutil
+
+        self._psutil = psutil
+        self.root = psutil.Process(root_pid)
+        self.interval = interval
+        self.peak_rss = 0
+        self._cpu_by_pid: Dict[int, float] = {}  # last seen CPU time; kept after a process exits
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bench-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    @property
+    def cpu_seconds(self) -> float:
+        return sum(self._cpu_by_pid.values())
+
+    def sample(self) -> None:
+        try:
+            processes = [self.root] + self.root.children(recursive=True)
+        except self._psutil.Error:
+            return
+        rss = 0
+        for process in processes:
+            try:
+                cpu = process.cpu_times()
+                self._cpu_by_pid[process.pid] = cpu.user + cpu.system
+                rss += process.memory_info().rss
+            except self._psutil.Error:
+                continue
+        self.peak_rss = max(self.peak_rss, rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+def bench_profile(profile: str) -> Dict:
+    """Run one cycle in a fresh browser with the given profile and return its measurements."""
+    from .core import create_driver
+    from .runner import run_cycle
+    from .rules import load_alert_engine
+
+    start = time.perf_counter()
+    driver = create_driver(headless=(profile == "headless"))
+    startup_seconds = time.perf_counter() - start
+
+    sampler = ProcessTreeSampler(driver.service.process.pid)
+    sampler.start()
+    try:
+        success = run_cycle(driver, load_alert_engine(), dry_run=True)
+    finally:
+        cycle_seconds = time.perf_counter() - start - startup_seconds
+        sampler.stop()
+        driver.quit()
+
+    return {
+        "profile": profile,
+        "success": bool(success),
+        "startup_seconds": startup_seconds,
+        "cycle_seconds": cycle_seconds,
+        "cpu_seconds": sampler.cpu_seconds,
+        "peak_rss_mb": sampler.peak_rss / (1024 * 1024),
+    }
+
+
+def run_browser_bench(profiles: List[str], runs: int = 1) -> List[Dict]:
+    """Benchmark each profile `runs` times, alternating profiles between runs."""
+    results = []
+    for run in range(runs):
+        for profile in profiles:
+            if profile == "headed" and sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+                log.warning("⚠ Skipping headed profile: no DISPLAY available.")
+                continue
+            log.info("⏱ Benchmark run %s/%s: %s", run + 1, runs, profile)
+            results.append(bench_profile(profile))
+    return results
+
+
+def print_browser_report(results: List[Dict]) -> None:
+    """Print averages per profile."""
+    if not results:
+        print("ℹ No benchmark results.")
+        return
+
+    print("=" * 72)
+    print("🖥 Browser Profile Benchmark (averages per cycle)")
+    print("=" * 72)
+    print(f"{'Profile':<10} {'Runs':>4} {'OK':>4} {'Startup s':>10} {'Cycle s':>9} {'CPU s':>8} {'Peak RSS MB':>12}")
+
+    for profile in PROFILES:
+        rows = [r for r in results if r["profile"] == profile]
+        if not rows:
+            continue
+        n = len(rows)
+        print(
+            f"{profile:<10} {n:>4} {sum(r['success'] for r in rows):>4} "
+            f"{sum(r['startup_seconds'] for r in rows) / n:>10.1f} "
+            f"{sum(r['cycle_seconds'] for r in rows) / n:>9.1f} "
+            f"{sum(r['cpu_seconds'] for r in rows) / n:>8.1f} "
+            f"{sum(r['peak_rss_mb'] for r in rows) / n:>12.0f}"
+        )
+
+    print("\nNote: cycle time is dominated by the human-like random delays; CPU and RSS are the")
+    print("numbers that differ between profiles. RSS is summed over all browser processes.")
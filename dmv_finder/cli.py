@@ -0,0 +1,192 @@
+"""
+Command-line interface.
+
+    run          scan continuously (default)
+    once         scan every queued zip code once, then exit
+    status       show the current earliest date and zip code queues
+    history      show recently found dates
+    notify-test  send a test NTFY notification
+    bench        replay the page corpus through the offline parsers
+                 (--browser: compare headed vs. headless browser profiles)
+
+Heavy modules (selenium, webdriver_manager, requests) are imported inside the
+command that needs them, so read-only commands start without loading them.
+Logging (see log.py) is only set up for commands that scan or notify.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def _setup_logging(args) -> None:
+    from .config import LOG_LEVEL
+    from .log import setup_logging
+
+    setup_logging(args.log_level or LOG_LEVEL, json_console=args.json_logs)
+
+
+def cmd_run(args) -> int:
+    _setup_logging(args)
+    from .runner import run_forever
+
+    run_forever()
+    return 0
+
+
+def cmd_once(args) -> int:
+    _setup_logging(args)
+    from .runner import run_once
+
+    return 0 if run_once() else 1
+
+
+def cmd_status(args) -> int:
+    from .config import PARAMETERS_FILE
+    from .fingerprint import KIND_CALENDAR, KIND_OFFICE_LIST, read_change_stats
+    from .parameters import read_parameters
+
+    if not PARAMETERS_FILE.exists():
+        print(f"❌ Parameters file not found: {PARAMETERS_FILE}")
+        return 1
+
+    params = read_parameters()
+    print(f"📅 Earliest Date: {params['earliest_date'] or '-'}")
+    print(f"📍 Earliest Zip:  {params['earliest_zip'] or '-'}")
+    print(f"📋 Queued Zips:   {', '.join(params['zip_codes']) or '-'}")
+    print(f"✓ Checked Zips:  {', '.join(params['zip_codes_checked']) or '-'}")
+
+    stats = read_change_stats()
+    if stats:
+        print(f"\n🔁 Change detection (as of {stats['updated_at']}):")
+        for kind in (KIND_OFFICE_LIST, KIND_CALENDAR):
+            counts = stats.get(kind, {})
+            print(f"   {kind}: {counts.get('changed', 0)} changed, {counts.get('unchanged', 0)} unchanged, "
+                  f"{counts.get('expired', 0)} expired")
+    return 0
+
+
+def cmd_history(args) -> int:
+    from .history import read_history
+
+    entries = read_history(args.limit)
+    if not entries:
+        print("ℹ No history yet.")
+        return 0
+
+    for entry in entries:
+        marker = "🎉" if entry["is_earlier"] else "  "
+        print(f"{marker} {entry['observed_at']}  {entry['date']}  zip {entry['zip_code']}")
+    return 0
+
+
+def cmd_notify_test(args) -> int:
+    _setup_logging(args)
+    from .notify import send_ntfy_message
+
+    print("📢 Sending test notification...")
+    ok = send_ntfy_message(
+        "This is a test notification from DMV Appointment Finder.",
+        title="DMV Appointment Finder Test",
+        priority="default",
+        tags="test_tube",
+    )
+    return 0 if ok else 1
+
+
+def cmd_bench(args) -> int:
+    if args.browser:
+        return _bench_browser(args)
+
+    from .config import CORPUS_DIR
+    from .replay import print_replay_report, replay_corpus
+
+    results = replay_corpus(args.corpus or CORPUS_DIR, args.repeat)
+    return 0 if print_replay_report(results) else 1
+
+
+def _bench_browser(args) -> int:
+    try:
+        import psutil  # noqa: F401
+    except ImportError:
+        print("❌ The browser benchmark needs psutil: pip install psutil")
+        return 1
+
+    from .browser_bench import PROFILES, print_browser_report, run_browser_bench
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        print(f"❌ Unknown profile(s): {', '.join(unknown)} (choose from {', '.join(PROFILES)})")
+        return 1
+
+    _setup_logging(args)
+
+    results = run_browser_bench(profiles, args.runs)
+    print_browser_report(results)
+    return 0 if results and all(r["success"] for r in results) else 1
+
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+    return number
+
+
+def _logging_options(suppress_defaults: bool = False) -> argparse.ArgumentParser:
+    """
+    --log-level / --json-logs, accepted before or after the command name.
+    On subcommands the defaults are suppressed, so an option not repeated after the
+    command doesn't reset one given before it.
+    """
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                         default=argparse.SUPPRESS if suppress_defaults else None,
+                         help="log level for scanning commands (default: config.LOG_LEVEL)")
+    options.add_argument("--json-logs", action="store_true",
+                         default=argparse.SUPPRESS if suppress_defaults else False,
+                         help="write console logs as JSON lines (e.g. for journald)")
+    return options
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="DMV Appointment Finder - checks appointment slots and notifies via NTFY.sh.",
+        parents=[_logging_options()],
+    )
+    common = [_logging_options(suppress_defaults=True)]
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    subparsers.add_parser("run", parents=common, help="scan continuously (default)").set_defaults(func=cmd_run)
+    subparsers.add_parser("once", parents=common, help="scan every queued zip code once, then exit").set_defaults(func=cmd_once)
+    subparsers.add_parser("status", help="show the current earliest date and zip queues").set_defaults(func=cmd_status)
+
+    history = subparsers.add_parser("history", help="show recently found dates")
+    history.add_argument("-n", "--limit", type=_non_negative_int, default=20, help="number of entries to show (default: 20)")
+    history.set_defaults(func=cmd_history)
+
+    subparsers.add_parser("notify-test", parents=common, help="send a test NTFY notification").set_defaults(func=cmd_notify_test)
+
+    bench = subparsers.add_parser("bench", parents=common,
+                                  help="replay the page corpus through the offline parsers (or --browser)")
+    bench.add_argument("--corpus", type=Path, help="corpus directory (default: config.CORPUS_DIR)")
+    bench.add_argument("--repeat", type=int, default=5, help="timing runs per page (default: 5)")
+    bench.add_argument("--browser", action="store_true",
+                       help="instead, compare CPU, RSS and cycle time of browser profiles (runs real dry-run cycles)")
+    bench.add_argument("--profiles", default="headed,headless", help="with --browser: profiles to compare")
+    bench.add_argument("--runs", type=int, default=1, help="with --browser: cycles per profile (default: 1)")
+    bench.set_defaults(func=cmd_bench)
+
+    parser.set_defaults(func=cmd_run)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
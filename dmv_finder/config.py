@@ -3,6 +3,13 @@ from pathlib import Path
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 PARAMETERS_FILE = BASE_DIR / "Management" / "parameters.md"
+ALERT_RULES_FILE = BASE_DIR / "Management" / "alert_rules.md"
+CORPUS_DIR = BASE_DIR / "corpus"
+HISTORY_FILE = BASE_DIR / "history.jsonl"
+LOG_DIR = BASE_DIR / "logs"
+CHANGE_STATS_FILE = BASE_DIR / "change_stats.json"
+ARTIFACT_DIR = BASE_DIR / "artifacts"
+CHROME_PROFILE_DIR = BASE_DIR / ".chrome-profile"  # Headless profile: keeps the HTTP cache; cookies are cleared at each start
 
 # URL
 DMV_URL = "https://www.dmv.ca.gov/portal/appointments/select-appointment-type"
@@ -12,7 +19,24 @@ NTFY_TOPIC = "pinars_dmv_appointments"
 NTFY_URL = f"https://ntfy.sh/{NTFY_TOPIC}"
 
 # Browser Config
-HEADLESS_MODE = False  # Set to True to run without visible browser (NOTE: DMV site may not work properly in headless mode)
+HEADLESS_MODE = False  # Set to True to run the lean headless profile (no visible browser, less CPU/memory)
+HEADLESS_WINDOW_SIZE = "1280,900"  # Small viewport, still wide enough for the desktop calendar layout
+
+# Page Corpus
+CAPTURE_CORPUS = False  # Set to True to snapshot every visited page into CORPUS_DIR (replay with: python -m dmv_finder.replay)
+
+# Logging
+LOG_LEVEL = "INFO"                   # DEBUG shows every wait and comparison
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024  # Rotate logs/*.log at this size...
+LOG_FILE_BACKUP_COUNT = 5            # ...keeping this many old files
+HTML_DEBUG_SAMPLE_RATE = 0.1         # Fraction of matching calendar segments whose HTML goes to logs/debug_html.log (0 = off)
+
+# Debug Artifacts (page source, screenshot, console log saved on every failed step)
+ARTIFACT_MAX_BYTES = 200 * 1024 * 1024  # Oldest artifacts are deleted beyond this total size...
+ARTIFACT_MAX_AGE_DAYS = 7               # ...or after this many days
+
+# Change Detection
+FINGERPRINT_MAX_AGE_MINUTES = 60  # An unchanged calendar is still read in full again after this long
 
 # Selectors
 SELECTORS = {
@@ -22,6 +46,7 @@ SELECTORS = {
     "submit_btn": "#appointment-type-selector > div > div:nth-child(2) > div > div.button-holder > button",
     "zip_input": "#inputKeyWord",
     "search_btn": "#locations-search > button",
+    "office_list": "#js-location-result-list",
     "first_office": "#js-location-result-list > li:nth-child(1) > div > div.search-card__options > div > button",
     "calendar_label": "#rbc-toolbar-label",
     "back_btn": "#appointments-react-root > section > div.appointments__top-bar > div > div:nth-child(2) > a",
@@ -1,37 +1,135 @@
+import logging
 import time
 import random
+from typing import Optional
+from urllib.parse import urlsplit
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
-from dmv_finder.config import HEADLESS_MODE
+from dmv_finder.artifacts import capture_failure
+from dmv_finder.config import HEADLESS_MODE, HEADLESS_WINDOW_SIZE, CHROME_PROFILE_DIR, CAPTURE_CORPUS, DMV_URL
+from dmv_finder.corpus import capture_page, KIND_CAPTCHA
+from dmv_finder.parsing import find_captcha_indicator
 
-def create_driver() -> webdriver.Chrome:
-    """Create a simple Chrome WebDriver instance."""
+log = logging.getLogger(__name__)
+
+def create_driver(headless: Optional[bool] = None) -> webdriver.Chrome:
+    """
+    Create a Chrome WebDriver instance.
+    headless=None uses HEADLESS_MODE from config. The headless profile is a lean one:
+    no GPU/extensions, small viewport, a fixed profile dir and fewer renderer processes.
+    """
+    if headless is None:
+        headless = HEADLESS_MODE
+    
     options = Options()
     
-    if HEADLESS_MODE:
+    if headless:
         options.add_argument("--headless=new") # Modern headless mode
-        options.add_argument("--window-size=1920,1080")
-        
-    options.add_argument("--start-maximized")
+        options.add_argument(f"--window-size={HEADLESS_WINDOW_SIZE}")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-dev-shm-usage")  # /dev/shm is tiny in containers
+        options.add_argument("--renderer-process-limit=2")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        options.add_argument("--mute-audio")
+    else:
+        options.add_argument("--start-maximized")
+    
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})  # console log for debug artifacts
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    driver_path = ChromeDriverManager().install()
+    if headless:
+        driver = _start_headless(driver_path, options)
+    else:
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
     
-    # Remove webdriver flag
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    # Remove webdriver flag on every page (a plain execute_script only covers the current document)
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+    })
+    
+    if headless:
+        _hide_headless_user_agent(driver)
     
     return driver
 
+def _hide_headless_user_agent(driver: webdriver.Chrome) -> None:
+    """
+    Headless Chrome announces itself as "HeadlessChrome" in the UA string AND in the client hints
+    (Sec-CH-UA headers, navigator.userAgentData). Override both together so they agree; if the
+    client hints can't be read, leave everything as is rather than send a mismatched pair.
+    """
+    user_agent = driver.execute_script("return navigator.userAgent")
+    if "HeadlessChrome" not in user_agent:
+        return
+    try:
+        hints = driver.execute_script(
+            "return navigator.userAgentData && navigator.userAgentData.getHighEntropyValues("
+            "['architecture', 'bitness', 'model', 'platformVersion', 'fullVersionList'])"
+        )
+    except Exception as e:
+        hints = None
+        log.debug("Could not read client hints: %s", e)
+    if not hints:
+        log.warning("⚠ Client hints unavailable; headless user agent left unchanged.")
+        return
+    
+    def brands(entries):
+        return [{"brand": entry["brand"].replace("HeadlessChrome", "Google Chrome"), "version": entry["version"]}
+                for entry in entries or []]
+    
+    driver.execute_cdp_cmd("Network.setUserAgentOverride", {
+        "userAgent": user_agent.replace("HeadlessChrome", "Chrome"),
+        "userAgentMetadata": {
+            "brands": brands(hints.get("brands")),
+            "fullVersionList": brands(hints.get("fullVersionList")),
+            "platform": hints.get("platform", ""),
+            "platformVersion": hints.get("platformVersion", ""),
+            "architecture": hints.get("architecture", ""),
+            "model": hints.get("model", ""),
+            "mobile": bool(hints.get("mobile", False)),
+            "bitness": hints.get("bitness", ""),
+        },
+    })
+
+def _start_headless(driver_path: str, options: Options) -> webdriver.Chrome:
+    """
+    Start headless Chrome on the fixed profile in CHROME_PROFILE_DIR, so the HTTP cache survives
+    restarts. If another run holds the profile lock, fall back to a throwaway profile.
+    Cookies and DMV site storage are cleared either way: perform_login expects a fresh session.
+    """
+    profile_arg = f"--user-data-dir={CHROME_PROFILE_DIR / 'headless'}"
+    options.add_argument(profile_arg)
+    try:
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    except SessionNotCreatedException as e:
+        if "already in use" not in str(e):
+            raise
+        log.warning("⚠ Headless profile is in use by another run; using a throwaway profile instead.")
+        options.arguments.remove(profile_arg)
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    
+    parts = urlsplit(DMV_URL)
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+        "origin": f"{parts.scheme}://{parts.netloc}",
+        "storageTypes": "local_storage,session_storage,indexeddb,service_workers",
+    })
+    return driver
+
 def random_delay(min_sec: float = 8.0, max_sec: float = 15.0) -> None:
     """Sleep for a random duration to mimic human behavior and avoid reCAPTCHA."""
     delay = random.uniform(min_sec, max_sec)
-    print(f"  ⏳ Waiting {delay:.1f}s...")
+    log.debug("  ⏳ Waiting %.1fs...", delay)
     time.sleep(delay)
 
 def human_type(element, text: str) -> None:
@@ -48,31 +146,18 @@ def check_for_captcha(driver) -> bool:
     Note: The CAPTCHA widget may always be present on the page, but we only
     care if it's actively blocking the user (showing a challenge).
     """
-    # Indicators of an ACTIVE captcha challenge (not just widget presence)
-    active_captcha_indicators = [
-        "recaptcha-checkbox-checked",  # Already solved
-        "rc-imageselect",              # Image challenge visible
-        "rc-doscaptcha-body",          # "Try again later" message
-        "recaptcha-verify-button",     # Verify button visible
-    ]
-    
     try:
-        page_source = driver.page_source.lower()
-        
-        # Check if checkbox is already checked (solved) - this is fine
-        if "recaptcha-checkbox-checked" in page_source:
-            return False  # CAPTCHA is solved, no issue
-        
-        # Check for active challenge indicators
-        for indicator in active_captcha_indicators[1:]:  # Skip the "checked" one
-            if indicator.lower() in page_source:
-                print(f"🛑 Active CAPTCHA challenge detected: {indicator}")
-                return True
+        indicator = find_captcha_indicator(driver.page_source)
+        if indicator:
+            log.warning("🛑 Active CAPTCHA challenge detected: %s", indicator)
+            if CAPTURE_CORPUS:
+                capture_page(driver, KIND_CAPTCHA, expected=indicator)
+            return True
         
         return False
         
     except Exception as e:
-        print(f"⚠ CAPTCHA check error: {e}")
+        log.warning("⚠ CAPTCHA check error: %s", e)
         return False
 
 def handle_captcha_and_retry(driver, current_url: str, wait_minutes: int = 3) -> bool:
@@ -83,17 +168,18 @@ def handle_captcha_and_retry(driver, current_url: str, wait_minutes: int = 3) ->
     if not check_for_captcha(driver):
         return False  # No active CAPTCHA, proceed normally
     
-    print(f"⏳ Waiting {wait_minutes} minutes before retrying...")
+    log.info("⏳ Waiting %s minutes before retrying...", wait_minutes)
     time.sleep(wait_minutes * 60)
     
-    print("🔄 Reloading page...")
+    log.info("🔄 Reloading page...")
     driver.get(current_url)
     random_delay(5, 10)  # Wait for page to load
     
     # Check again after reload
     if check_for_captcha(driver):
-        print("🛑 CAPTCHA still active after waiting. Manual intervention may be needed.")
+        log.warning("🛑 CAPTCHA still active after waiting. Manual intervention may be needed.")
+        capture_failure(driver, "captcha")
         return True  # Still blocked
     
-    print("✅ CAPTCHA cleared! Continuing...")
+    log.info("✅ CAPTCHA cleared! Continuing...")
     return False  # CAPTCHA cleared
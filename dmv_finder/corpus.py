@@ -0,0 +1,99 @@
+"""
+Record side of the page corpus.
+
+Every page state the flow visits (office list, calendar months, CAPTCHA pages)
+can be stored as a gzip-compressed, content-addressed snapshot:
+
+    corpus/objects/<sha[:2]>/<sha>.html.gz   - page source (stored once per unique page)
+    corpus/index.jsonl                       - one metadata line per visit
+
+The replay harness (replay.py) reads the same layout back.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from .config import CORPUS_DIR
+
+log = logging.getLogger(__name__)
+
+INDEX_NAME = "index.jsonl"
+OBJECTS_DIR_NAME = "objects"
+
+# Page kinds understood by the replay harness
+KIND_CALENDAR = "calendar"
+KIND_OFFICE_LIST = "office_list"
+KIND_CAPTCHA = "captcha"
+
+
+def object_path(sha256: str, corpus_dir: Path = CORPUS_DIR) -> Path:
+    """Path of the compressed snapshot for a content hash."""
+    return corpus_dir / OBJECTS_DIR_NAME / sha256[:2] / f"{sha256}.html.gz"
+
+
+def store_page(page_source: str, kind: str, corpus_dir: Path = CORPUS_DIR, **metadata) -> Dict:
+    """
+    Store a page snapshot and append its metadata to the index.
+    Identical pages share one object file. Returns the index entry.
+    """
+    data = page_source.encode("utf-8")
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    path = object_path(sha256, corpus_dir)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        # mtime=0 keeps the compressed bytes deterministic for identical pages
+        with open(tmp_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(data)
+        tmp_path.replace(path)
+
+    entry = {
+        "sha256": sha256,
+        "kind": kind,
+        "captured_at": datetime.now().isoformat(timespec="seconds"),
+        "size": len(data),
+        **metadata,
+    }
+    with open(corpus_dir / INDEX_NAME, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def capture_page(driver, kind: str, page_source: Optional[str] = None, **metadata) -> Optional[Dict]:
+    """
+    Snapshot the driver's current page into the corpus. Never raises.
+    Pass page_source when it was already fetched, so the stored page is the one that was parsed.
+    """
+    try:
+        if page_source is None:
+            page_source = driver.page_source
+        entry = store_page(page_source, kind, url=driver.current_url, **metadata)
+        log.debug("  📸 Captured %s page (%s)", kind, entry['sha256'][:12])
+        return entry
+    except Exception as e:
+        log.warning("  ⚠ Corpus capture failed: %s", e)
+        return None
+
+
+def iter_index(corpus_dir: Path = CORPUS_DIR) -> Iterator[Dict]:
+    """Yield index entries in capture order."""
+    index_path = corpus_dir / INDEX_NAME
+    if not index_path.exists():
+        return
+    with open(index_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_page(sha256: str, corpus_dir: Path = CORPUS_DIR) -> str:
+    """Read back a stored page source."""
+    with gzip.open(object_path(sha256, corpus_dir), "rb") as f:
+        return f.read().decode("utf-8")
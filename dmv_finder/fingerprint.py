@@ -0,0 +1,136 @@
+"""
+Change detection for office lists and calendars.
+
+A compact hash (32-bit FNV-1a over the relevant textContent) is computed
+in-page with one execute_script call, so only 8 hex characters cross the
+WebDriver connection. When a calendar's fingerprint matches the previous
+visit, parsing it is skipped and the dates read last time are reused, so the
+comparison and rule evaluation still run against today's date and the
+current stored earliest date. An office list that changed forces its
+calendar to be read again (the first office may be a different one).
+
+A fingerprint is only committed if the page still hashes the same after it
+was parsed (so a half-rendered calendar is never cached), and it expires
+after FINGERPRINT_MAX_AGE_MINUTES, when the page is read in full again.
+
+Fingerprints (and the cached dates) are kept in memory for the life of the
+process (a restart re-checks everything once). Unchanged/changed/expired
+counters are written to CHANGE_STATS_FILE for the `status` command.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .config import CHANGE_STATS_FILE, FINGERPRINT_MAX_AGE_MINUTES
+
+log = logging.getLogger(__name__)
+
+KIND_OFFICE_LIST = "office_list"
+KIND_CALENDAR = "calendar"
+
+_FNV1A_JS = """
+function fnv1a(s) {
+    let h = 0x811c9dc5;
+    for (let i = 0; i < s.length; i++) {
+        h ^= s.charCodeAt(i);
+        h = Math.imul(h, 0x01000193);
+    }
+    return (h >>> 0).toString(16).padStart(8, '0');
+}
+"""
+
+# arguments[0]: office list selector
+OFFICE_LIST_FINGERPRINT_JS = _FNV1A_JS + """
+const list = document.querySelector(arguments[0]);
+if (!list) return null;
+return fnv1a(list.textContent) + ':' + list.children.length;
+"""
+
+# arguments[0]: calendar label selector
+CALENDAR_FINGERPRINT_JS = _FNV1A_JS + """
+const segments = document.querySelectorAll('.rbc-row-segment');
+if (!segments.length) return null;
+const label = document.querySelector(arguments[0]);
+let text = label ? label.textContent : '';
+for (const segment of segments) text += '\\u001f' + segment.textContent;
+return fnv1a(text) + ':' + segments.length;
+"""
+
+
+class FingerprintCache:
+    """Last fingerprint and parsed data per (zip, page kind), plus unchanged / changed / expired counters per kind."""
+
+    def __init__(self, max_age_seconds: float = FINGERPRINT_MAX_AGE_MINUTES * 60):
+        self.max_age_seconds = max_age_seconds
+        self.fingerprints: Dict[str, str] = {}
+        self.committed_at: Dict[str, float] = {}
+        self.data: Dict[str, Any] = {}
+        self.counters = {
+            kind: {"unchanged": 0, "changed": 0, "expired": 0} for kind in (KIND_OFFICE_LIST, KIND_CALENDAR)
+        }
+
+    @staticmethod
+    def _key(zip_code: str, kind: str) -> str:
+        return f"{zip_code}:{kind}"
+
+    def is_unchanged(self, zip_code: str, kind: str, fingerprint: Optional[str]) -> bool:
+        """True when fingerprint matches the last committed one and hasn't expired. Counts the outcome."""
+        key = self._key(zip_code, kind)
+        if fingerprint is None or self.fingerprints.get(key) != fingerprint:
+            outcome = "changed"
+        elif time.monotonic() - self.committed_at[key] > self.max_age_seconds:
+            outcome = "expired"
+        else:
+            outcome = "unchanged"
+        self.counters[kind][outcome] += 1
+        return outcome == "unchanged"
+
+    def commit(self, zip_code: str, kind: str, fingerprint: Optional[str], data: Any = None) -> None:
+        """Remember a fingerprint (and what was parsed from the page) once the page has been fully processed."""
+        if fingerprint is not None:
+            key = self._key(zip_code, kind)
+            self.fingerprints[key] = fingerprint
+            self.committed_at[key] = time.monotonic()
+            self.data[key] = data
+
+    def cached(self, zip_code: str, kind: str) -> Any:
+        """The data committed with the last fingerprint, or None."""
+        return self.data.get(self._key(zip_code, kind))
+
+    def invalidate(self, zip_code: str, kind: str) -> None:
+        """Forget a fingerprint so the next visit is processed in full."""
+        key = self._key(zip_code, kind)
+        self.fingerprints.pop(key, None)
+        self.committed_at.pop(key, None)
+        self.data.pop(key, None)
+
+    def save_stats(self) -> None:
+        """Write the counters for the `status` command. Never raises."""
+        stats = {"updated_at": datetime.now().isoformat(timespec="seconds"), **self.counters}
+        tmp_path = CHANGE_STATS_FILE.with_suffix(".tmp")
+        try:
+            # Replace in one step, so `status` never reads a half-written file
+            tmp_path.write_text(json.dumps(stats, indent=2))
+            tmp_path.replace(CHANGE_STATS_FILE)
+        except OSError as e:
+            log.warning("⚠ Could not write change stats: %s", e)
+
+
+def page_fingerprint(driver, script: str, *args) -> Optional[str]:
+    """Run a fingerprint script in the page. None if the page isn't there or the call fails."""
+    try:
+        return driver.execute_script(script, *args)
+    except Exception as e:
+        log.warning("  ⚠ Fingerprint failed: %s", e)
+        return None
+
+
+def read_change_stats() -> Optional[Dict]:
+    """Counters last written by a scan, or None (also when the file is missing or unreadable)."""
+    try:
+        return json.loads(CHANGE_STATS_FILE.read_text())
+    except (OSError, ValueError):
+        return None
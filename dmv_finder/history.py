@@ -0,0 +1,38 @@
+"""
+Append-only log of every date found by a scan (history.jsonl).
+Used by the `history` CLI command.
+"""
+
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, List
+
+from .config import HISTORY_FILE
+
+log = logging.getLogger(__name__)
+
+
+def record_observation(date: str, zip_code: str, is_earlier: bool) -> None:
+    """Append one found date to the history file. Never raises."""
+    entry = {
+        "observed_at": datetime.now().isoformat(timespec="seconds"),
+        "date": date,
+        "zip_code": zip_code,
+        "is_earlier": is_earlier,
+    }
+    try:
+        with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        log.warning("  ⚠ Could not write history: %s", e)
+
+
+def read_history(limit: int = 20) -> List[Dict]:
+    """Return the last `limit` history entries, oldest first."""
+    if not HISTORY_FILE.exists():
+        return []
+    with open(HISTORY_FILE, encoding="utf-8") as f:
+        lines = deque((line for line in f if line.strip()), maxlen=limit)
+    return [json.loads(line) for line in lines]
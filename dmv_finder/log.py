@@ -0,0 +1,201 @@
+"""
+Structured logging.
+
+All dmv_finder loggers hand their records to a queue; a background listener
+thread does the formatting and I/O (console + size-rotated JSON files), so a
+slow terminal or journald never blocks the scan.
+
+Every record carries the current cycle ID and zip code (set with
+new_cycle_id() / bind_zip()) so one cycle or one zip can be grepped out of
+the JSON log.
+
+Verbose HTML context goes to a separate, sampled debug channel
+(html_log / sample_html_context()) written to its own file.
+
+Section headers are single records logged with extra=BANNER (or CYCLE_BANNER);
+only the console draws the rule lines around them, the JSON log gets one
+plain record. Tracebacks are formatted on the writer thread and stored in
+their own "exc" field.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from .config import (
+    LOG_DIR,
+    LOG_FILE_MAX_BYTES,
+    LOG_FILE_BACKUP_COUNT,
+    HTML_DEBUG_SAMPLE_RATE,
+)
+
+ROOT_LOGGER = "dmv_finder"
+HTML_LOGGER = "dmv_finder.debug.html"
+
+cycle_id_var = contextvars.ContextVar("cycle_id", default="-")
+zip_code_var = contextvars.ContextVar("zip_code", default="-")
+
+html_log = logging.getLogger(HTML_LOGGER)
+
+BANNER = {"banner": "="}        # log.info("...", extra=BANNER)
+CYCLE_BANNER = {"banner": "#"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_html_sample_rate = HTML_DEBUG_SAMPLE_RATE
+
+
+class ContextFilter(logging.Filter):
+    """Stamp the caller's cycle ID and zip code on each record (runs on the calling thread)."""
+
+    def filter(self, record):
+        record.cycle_id = cycle_id_var.get()
+        record.zip_code = zip_code_var.get()
+        return True
+
+
+class ChannelFilter(logging.Filter):
+    """Pass only records from (include=True) or outside (include=False) the HTML debug channel."""
+
+    def __init__(self, include: bool):
+        super().__init__()
+        self.include = include
+
+    def filter(self, record):
+        return record.name.startswith(HTML_LOGGER) == self.include
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records without formatting them. The stock prepare() formats the whole record
+    (traceback included) on the calling thread and folds it into msg; here only the
+    message arguments are merged, and exc_info is left for the writer thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()  # args may change before the writer gets to them
+        record.args = None
+        return record
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Plain text; banner records are framed with rule lines."""
+
+    def format(self, record):
+        text = super().format(record)
+        rule_char = getattr(record, "banner", None)
+        if rule_char:
+            rule = rule_char * 60
+            return f"\n{rule}\n{text}\n{rule}"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "cycle_id": getattr(record, "cycle_id", "-"),
+            "zip_code": getattr(record, "zip_code", "-"),
+            "msg": record.getMessage().strip(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(level: str = "INFO", json_console: bool = False, html_sample_rate: Optional[float] = None) -> None:
+    """
+    Route all dmv_finder logging through a queue to a background writer.
+    Console output is plain text (or JSON with json_console=True); files are always JSON.
+    """
+    global _listener, _html_sample_rate
+    if _listener is not None:
+        return
+
+    if html_sample_rate is not None:
+        _html_sample_rate = html_sample_rate
+
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+    console = logging.StreamHandler()
+    console.setFormatter(JsonFormatter() if json_console else ConsoleFormatter("%(message)s"))
+    console.addFilter(ChannelFilter(include=False))
+
+    main_file = logging.handlers.RotatingFileHandler(
+        LOG_DIR / "dmv_finder.log", maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT, encoding="utf-8"
+    )
+    main_file.setFormatter(JsonFormatter())
+    main_file.addFilter(ChannelFilter(include=False))
+
+    html_file = logging.handlers.RotatingFileHandler(
+        LOG_DIR / "debug_html.log", maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT, encoding="utf-8"
+    )
+    html_file.setFormatter(JsonFormatter())
+    html_file.addFilter(ChannelFilter(include=True))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level.upper())
+    root.addHandler(queue_handler)
+    root.propagate = False
+
+    # The HTML channel is enabled independently of the main level; sampling decides what is kept
+    html_log.setLevel(logging.DEBUG if _html_sample_rate > 0 else logging.CRITICAL + 1)
+
+    _listener = logging.handlers.QueueListener(log_queue, console, main_file, html_file, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush pending records and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def sample_html_context() -> bool:
+    """
+    Decide whether to log HTML context for this event.
+    Check this BEFORE fetching outerHTML from the browser, so unsampled events cost nothing.
+    """
+    return html_log.isEnabledFor(logging.DEBUG) and random.random() < _html_sample_rate
+
+
+def new_cycle_id() -> str:
+    """Start a new correlation ID for a scan cycle and return it."""
+    cycle_id = uuid.uuid4().hex[:8]
+    cycle_id_var.set(cycle_id)
+    return cycle_id
+
+
+@contextlib.contextmanager
+def bind_zip(zip_code: str):
+    """Tag all records logged inside the block with this zip code."""
+    token = zip_code_var.set(zip_code)
+    try:
+        yield
+    finally:
+        zip_code_var.reset(token)
@@ -1,27 +1,40 @@
+import logging
+
 import requests
 from .config import NTFY_URL
 
-def send_ntfy_notification(date: str, zip_code: str) -> None:
-    """Send notification via NTFY.sh."""
-    print("📢 Sending NTFY notification...")
-    
-    message = f"Found an earlier DMV available date: {date}, Zip Code: {zip_code}"
-    
+log = logging.getLogger(__name__)
+
+def send_ntfy_message(message: str, title: str = "DMV Appointment Alert!", priority: str = "high", tags: str = "calendar,car") -> bool:
+    """Post a message to the NTFY.sh topic. Returns True on success."""
     try:
         response = requests.post(
             NTFY_URL,
             data=message.encode("utf-8"),
             headers={
-                "Title": "DMV Appointment Alert!",
-                "Priority": "high",
-                "Tags": "calendar,car"
+                "Title": title,
+                "Priority": priority,
+                "Tags": tags
             }
         )
         
         if response.status_code == 200:
-            print("✅ Notification sent successfully!")
+            log.info("✅ Notification sent successfully!")
+            return True
         else:
-            print(f"⚠ Notification failed with status: {response.status_code}")
+            log.warning("⚠ Notification failed with status: %s", response.status_code)
+            return False
             
     except Exception as e:
-        print(f"❌ Failed to send notification: {e}")
+        log.error("❌ Failed to send notification: %s", e)
+        return False
+
+def send_ntfy_notification(date: str, zip_code: str, rule: str = "") -> None:
+    """Send notification via NTFY.sh. `rule` names the alert rule when it isn't the plain 'earlier date' one."""
+    log.info("📢 Sending NTFY notification...")
+    
+    if rule:
+        message = f"Found a DMV available date matching '{rule}': {date}, Zip Code: {zip_code}"
+    else:
+        message = f"Found an earlier DMV available date: {date}, Zip Code: {zip_code}"
+    send_ntfy_message(message)
@@ -0,0 +1,218 @@
+"""
+Offline HTML parsers for DMV pages.
+
+These mirror the live Selenium logic in actions.py / core.py but work on a
+plain page source string, so captured pages can be replayed without a browser.
+Only the standard library is used here (no selenium import).
+"""
+
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Status labels that mark a calendar day as bookable
+AVAILABLE_LABELS = ("Open Times", "Nearby Office Times")
+
+# Indicators of an ACTIVE captcha challenge (not just widget presence)
+CAPTCHA_SOLVED_INDICATOR = "recaptcha-checkbox-checked"
+CAPTCHA_ACTIVE_INDICATORS = (
+    "rc-imageselect",              # Image challenge visible
+    "rc-doscaptcha-body",          # "Try again later" message
+    "recaptcha-verify-button",     # Verify button visible
+)
+
+# Elements that never have a closing tag
+_VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def format_calendar_date(date_text: str) -> Optional[str]:
+    """Convert 'Month Day, Year' into MM/DD/YYYY. Returns None if it doesn't parse."""
+    try:
+        return datetime.strptime(date_text, "%B %d, %Y").strftime("%m/%d/%Y")
+    except ValueError:
+        return None
+
+
+def find_captcha_indicator(page_source: str) -> Optional[str]:
+    """Return the active CAPTCHA indicator found in the page, or None."""
+    page_source = page_source.lower()
+
+    # Checkbox already checked (solved) - this is fine
+    if CAPTCHA_SOLVED_INDICATOR in page_source:
+        return None
+
+    for indicator in CAPTCHA_ACTIVE_INDICATORS:
+        if indicator in page_source:
+            return indicator
+    return None
+
+
+# ============================================================================
+# CALENDAR
+# ============================================================================
+
+class _SegmentCollector(HTMLParser):
+    """
+    Collect (status, date) text pairs for every .rbc-row-segment.
+    Text is gathered like textContent (hidden elements included).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.segments = []
+        self._depth = 0
+        self._segment_depth = None
+        self._status = None
+        self._date = None
+        self._capture = None        # "status" / "date" while inside a target span
+        self._capture_depth = None
+        self._buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        self._depth += 1
+        classes = ()
+        for name, value in attrs:
+            if name == "class" and value:
+                classes = value.split()
+                break
+
+        if self._segment_depth is None:
+            if "rbc-row-segment" in classes:
+                self._segment_depth = self._depth
+                self._status = None
+                self._date = None
+            return
+
+        if self._capture is None and tag == "span":
+            # Only the first matching span of each kind counts, like find_elements()[0]
+            if "rbc-event-available" in classes and self._status is None:
+                self._capture = "status"
+            elif "rbc-event-day-num--mobile" in classes and self._date is None:
+                self._capture = "date"
+            if self._capture:
+                self._capture_depth = self._depth
+                self._buffer = []
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags don't open a scope
+        pass
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS or self._depth == 0:
+            return
+
+        if self._capture is not None and self._depth == self._capture_depth:
+            text = "".join(self._buffer).strip()
+            if self._capture == "status":
+                self._status = text
+            else:
+                self._date = text
+            self._capture = None
+            self._capture_depth = None
+
+        if self._segment_depth is not None and self._depth == self._segment_depth:
+            self.segments.append((self._status, self._date))
+            self._segment_depth = None
+
+        self._depth -= 1
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._buffer.append(data)
+
+
+def parse_calendar_segments(page_source: str) -> List[tuple]:
+    """Return (status_text, date_text) for each calendar segment, in page order."""
+    collector = _SegmentCollector()
+    collector.feed(page_source)
+    collector.close()
+    return collector.segments
+
+
+def parse_calendar_slots_html(page_source: str) -> List[str]:
+    """Return every available date (MM/DD/YYYY) on the calendar page, in page order."""
+    slots = []
+    for status, date_text in parse_calendar_segments(page_source):
+        if status in AVAILABLE_LABELS and date_text:
+            formatted_date = format_calendar_date(date_text)
+            if formatted_date:
+                slots.append(formatted_date)
+    return slots
+
+
+def parse_calendar_html(page_source: str) -> Optional[str]:
+    """First available date on the calendar page (in page order), or None."""
+    for status, date_text in parse_calendar_segments(page_source):
+        if status in AVAILABLE_LABELS and date_text:
+            formatted_date = format_calendar_date(date_text)
+            if formatted_date:
+                return formatted_date
+    return None
+
+
+# ============================================================================
+# OFFICE LIST
+# ============================================================================
+
+class _OfficeListCollector(HTMLParser):
+    """Collect the text of each <li> directly under #js-location-result-list."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.offices = []
+        self._depth = 0
+        self._list_depth = None
+        self._item_depth = None
+        self._buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        self._depth += 1
+
+        if self._list_depth is None:
+            if ("id", "js-location-result-list") in attrs:
+                self._list_depth = self._depth
+        elif self._item_depth is None and tag == "li" and self._depth == self._list_depth + 1:
+            self._item_depth = self._depth
+            self._buffer = []
+
+    def handle_startendtag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS or self._depth == 0:
+            return
+
+        if self._item_depth is not None and self._depth == self._item_depth:
+            self.offices.append(normalize_text("".join(self._buffer)))
+            self._item_depth = None
+        elif self._list_depth is not None and self._depth == self._list_depth:
+            self._list_depth = None
+
+        self._depth -= 1
+
+    def handle_data(self, data):
+        if self._item_depth is not None:
+            self._buffer.append(data)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse all whitespace runs to single spaces."""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def parse_office_list_html(page_source: str) -> List[str]:
+    """Return the normalized text of each office result, in page order."""
+    collector = _OfficeListCollector()
+    collector.feed(page_source)
+    collector.close()
+    return collector.offices
@@ -0,0 +1,145 @@
+"""
+Replay harness for the page corpus.
+
+Runs the offline calendar / office / CAPTCHA parsers over every captured page,
+checks the result against what the live parser returned at capture time, and
+reports parse throughput and allocation per page.
+
+Usage:
+    python -m dmv_finder.replay [--repeat N] [--corpus DIR]
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict
+
+from .config import CORPUS_DIR
+from .corpus import KIND_CALENDAR, KIND_CAPTCHA, KIND_OFFICE_LIST, iter_index, load_page
+from .parsing import find_captcha_indicator, parse_calendar_html, parse_office_list_html
+
+PARSERS = {
+    KIND_CALENDAR: parse_calendar_html,
+    KIND_OFFICE_LIST: parse_office_list_html,
+    KIND_CAPTCHA: find_captcha_indicator,
+}
+
+
+def _new_stats() -> Dict:
+    return {
+        "pages": 0,
+        "passed": 0,
+        "failed": 0,
+        "unchecked": 0,
+        "bytes": 0,
+        "seconds": 0.0,
+        "peak_alloc_total": 0,
+        "peak_alloc_max": 0,
+        "failures": [],
+    }
+
+
+def replay_corpus(corpus_dir: Path = CORPUS_DIR, repeat: int = 5) -> Dict[str, Dict]:
+    """
+    Replay every indexed page. Returns per-kind stats.
+    Timing uses the best of `repeat` runs; allocation is measured in a separate
+    tracemalloc pass so it doesn't skew the timings.
+    """
+    results = {}
+    pages = {}  # sha256 -> page source, decompressed once
+
+    for entry in iter_index(corpus_dir):
+        parser = PARSERS.get(entry["kind"])
+        if parser is None:
+            continue
+
+        sha256 = entry["sha256"]
+        if sha256 not in pages:
+            pages[sha256] = load_page(sha256, corpus_dir)
+        page_source = pages[sha256]
+
+        stats = results.setdefault(entry["kind"], _new_stats())
+        stats["pages"] += 1
+        stats["bytes"] += len(page_source)
+
+        # Correctness
+        result = parser(page_source)
+        if "expected" not in entry:
+            stats["unchecked"] += 1
+        elif result == entry["expected"]:
+            stats["passed"] += 1
+        else:
+            stats["failed"] += 1
+            stats["failures"].append({
+                "sha256": sha256,
+                "captured_at": entry.get("captured_at"),
+                "expected": entry["expected"],
+                "got": result,
+            })
+
+        # Throughput
+        best = None
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            parser(page_source)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        stats["seconds"] += best
+
+        # Allocation
+        tracemalloc.start()
+        try:
+            parser(page_source)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        stats["peak_alloc_total"] += peak
+        stats["peak_alloc_max"] = max(stats["peak_alloc_max"], peak)
+
+    return results
+
+
+def print_replay_report(results: Dict[str, Dict]) -> bool:
+    """Print the replay summary. Returns True when no page failed."""
+    if not results:
+        print("ℹ Corpus is empty. Enable CAPTURE_CORPUS in config.py and run a cycle first.")
+        return True
+
+    print("=" * 60)
+    print("🔁 Corpus Replay Results")
+    print("=" * 60)
+
+    all_passed = True
+    for kind, stats in sorted(results.items()):
+        pages = stats["pages"]
+        seconds = stats["seconds"]
+        pages_per_sec = pages / seconds if seconds else float("inf")
+        mb_per_sec = stats["bytes"] / seconds / 1e6 if seconds else float("inf")
+        avg_alloc_kb = stats["peak_alloc_total"] / pages / 1024
+
+        print(f"\n📄 {kind}: {pages} pages")
+        print(f"   Correctness: {stats['passed']} passed, {stats['failed']} failed, {stats['unchecked']} unchecked")
+        print(f"   Throughput:  {pages_per_sec:,.0f} pages/s ({mb_per_sec:.1f} MB/s)")
+        print(f"   Peak alloc:  {avg_alloc_kb:,.1f} KiB/page avg, {stats['peak_alloc_max'] / 1024:,.1f} KiB max")
+
+        for failure in stats["failures"]:
+            all_passed = False
+            print(f"   ❌ {failure['sha256'][:12]} ({failure['captured_at']}): "
+                  f"expected {failure['expected']!r}, got {failure['got']!r}")
+
+    return all_passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured DMV pages through the offline parsers.")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR, help="corpus directory")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per page (best is kept)")
+    args = parser.parse_args()
+
+    ok = print_replay_report(replay_corpus(args.corpus, args.repeat))
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Alert-criteria rule engine.
+
+Rules are read once from Management/alert_rules.md and compiled into plain
+integer predicates, so each observed slot costs a few comparisons:
+
+    #### Rule: Soon in Pleasanton
+    - Date From: 11/01/2026
+    - Date To: 12/15/2026
+    - Within Days: 30
+    - Excluded Weekdays: Sat, Sun
+    - Preferred Offices: 94588, Pleasanton
+    - Blocked Offices: 95304
+    - Earlier Than Stored: yes
+    - Cooldown Minutes: 60
+    - Enabled: yes
+
+Every criterion of a rule must match. Offices are matched by zip code
+(5 digits) or by a case-insensitive piece of the office name. A rule with a
+value that doesn't parse is logged (with the rule name and line) and skipped.
+
+A rule alerts only when it NEWLY matches a slot (a date/office it didn't match
+on the previous look at that zip), and at most once per cooldown. Matches held
+back by the cooldown are kept as pending and alerted once it ends, as long as
+the slot is still on the calendar (even if the stored earliest date has since
+moved past it).
+"""
+
+import logging
+import re
+import time
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from .config import ALERT_RULES_FILE
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RULE_NAME = "Earlier Than Stored"
+NO_DATE = 10 ** 9  # Ordinal later than any real date ("no stored date yet")
+
+WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+
+class Observation(NamedTuple):
+    date: str       # MM/DD/YYYY, as shown to the user
+    zip_code: str
+    office: str
+    ordinal: int    # date.toordinal()
+    weekday: int    # Monday = 0
+
+
+class Alert(NamedTuple):
+    rule: "Rule"
+    observation: Observation   # earliest newly matched slot
+    new_matches: int
+
+
+@lru_cache(maxsize=4096)
+def date_ordinal(date_text: str) -> int:
+    """MM/DD/YYYY -> date ordinal. Cached: the same few dates repeat every cycle."""
+    month, day, year = date_text.strip().split("/")
+    return date(int(year), int(month), int(day)).toordinal()
+
+
+def make_observation(date_text: str, zip_code: str, office: str = "") -> Observation:
+    """Build an Observation for one available slot."""
+    ordinal = date_ordinal(date_text)
+    return Observation(date_text, zip_code, office, ordinal, (ordinal - 1) % 7)
+
+
+# ============================================================================
+# COMPILATION
+# ============================================================================
+
+class Rule:
+    """A compiled rule plus its match / cooldown state."""
+
+    def __init__(self, name: str, criteria: Dict[str, str]):
+        self.name = name
+        self.cooldown_seconds = _criterion(criteria, "cooldown minutes", lambda v: float(v or 0) * 60, "0")
+        self.earlier_than_stored = _is_yes(criteria.get("earlier than stored", "no"))
+        self.uses_office_names = False
+        self.match = self._compile(criteria)
+
+        self.last_alert_at: Optional[float] = None
+        self.seen: Dict[str, Set[tuple]] = {}   # zip -> (ordinal, office) keys matched last time
+        self.pending: Dict[tuple, Observation] = {}  # (zip, ordinal, office) -> match held back by the cooldown
+
+    def _compile(self, criteria: Dict[str, str]) -> Callable[[Observation, int, int], bool]:
+        """Build match(obs, today_ordinal, stored_ordinal) from the criteria."""
+        checks = []
+
+        if "date from" in criteria:
+            lo = _criterion(criteria, "date from", date_ordinal)
+            checks.append(lambda obs, today, stored: obs.ordinal >= lo)
+        if "date to" in criteria:
+            hi = _criterion(criteria, "date to", date_ordinal)
+            checks.append(lambda obs, today, stored: obs.ordinal <= hi)
+        if "within days" in criteria:
+            days = _criterion(criteria, "within days", int)
+            checks.append(lambda obs, today, stored: obs.ordinal - today <= days)
+        if criteria.get("excluded weekdays"):
+            excluded = _criterion(criteria, "excluded weekdays",
+                                  lambda v: frozenset(_parse_weekday(d) for d in _split_list(v)))
+            checks.append(lambda obs, today, stored: obs.weekday not in excluded)
+        if criteria.get("preferred offices"):
+            preferred = self._compile_office_matcher(criteria["preferred offices"])
+            checks.append(lambda obs, today, stored: preferred(obs.zip_code, obs.office))
+        if criteria.get("blocked offices"):
+            blocked = self._compile_office_matcher(criteria["blocked offices"])
+            checks.append(lambda obs, today, stored: not blocked(obs.zip_code, obs.office))
+        if self.earlier_than_stored:
+            checks.append(lambda obs, today, stored: obs.ordinal < stored)
+
+        if not checks:
+            return lambda obs, today, stored: True
+
+        # Chain the checks into one short-circuiting function
+        match = checks[0]
+        for check in checks[1:]:
+            match = _both(match, check)
+        return match
+
+    def _compile_office_matcher(self, value: str) -> Callable[[str, str], bool]:
+        """Zip codes match exactly, anything else is a case-insensitive office-name fragment."""
+        zips = set()
+        names = []
+        for term in _split_list(value):
+            if re.fullmatch(r"\d{5}", term):
+                zips.add(term)
+            else:
+                names.append(term.lower())
+        if names:
+            self.uses_office_names = True
+
+        cache: Dict[tuple, bool] = {}  # few distinct offices per cycle
+
+        def matches(zip_code: str, office: str) -> bool:
+            key = (zip_code, office)
+            result = cache.get(key)
+            if result is None:
+                office_lower = office.lower()
+                result = zip_code in zips or any(name in office_lower for name in names)
+                cache[key] = result
+            return result
+
+        return matches
+
+
+def _criterion(criteria: Dict[str, str], key: str, convert: Callable, default: Optional[str] = None):
+    """Convert one criterion value; a ValueError names the offending line."""
+    value = criteria.get(key, default)
+    try:
+        return convert(value)
+    except ValueError as e:
+        raise ValueError(f"bad line '- {key.title()}: {value}' ({e})") from None
+
+
+def _both(first: Callable, second: Callable) -> Callable:
+    return lambda obs, today, stored: first(obs, today, stored) and second(obs, today, stored)
+
+
+def _is_yes(value: str) -> bool:
+    return value.strip().lower() in ("yes", "true", "on", "1")
+
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _parse_weekday(name: str) -> int:
+    try:
+        return WEEKDAYS[name.strip().lower()[:3]]
+    except KeyError:
+        raise ValueError(f"Unknown weekday: {name!r}")
+
+
+def default_rules() -> List[Rule]:
+    """The original behavior: alert when a date is earlier than the stored earliest."""
+    return [Rule(DEFAULT_RULE_NAME, {"earlier than stored": "yes"})]
+
+
+def parse_rules(content: str) -> List[Rule]:
+    """Parse the alert_rules.md format (see module docstring)."""
+    rules = []
+    for match in re.finditer(r"^#+[ \t]*Rule:[ \t]*(.+)$", content, re.MULTILINE):
+        name = match.group(1).strip()
+        body_end = content.find("\n#", match.end())
+        body = content[match.end():body_end if body_end != -1 else len(content)]
+
+        criteria = {}
+        for key, value in re.findall(r"^[ \t]*-[ \t]*([^:\n]+):[ \t]*(.*)$", body, re.MULTILINE):
+            criteria[key.strip().lower()] = value.strip()
+
+        if not _is_yes(criteria.get("enabled", "yes")):
+            continue
+        try:
+            rules.append(Rule(name, criteria))
+        except ValueError as e:
+            log.error("❌ Alert rule '%s' skipped: %s", name, e)
+    return rules
+
+
+def load_rules() -> List[Rule]:
+    """Read and compile the rules file. Falls back to default_rules() when missing or empty."""
+    if ALERT_RULES_FILE.exists():
+        rules = parse_rules(ALERT_RULES_FILE.read_text())
+        if rules:
+            return rules
+    return default_rules()
+
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+class AlertEngine:
+    """Evaluates observed slots against compiled rules, keeping state across cycles."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self.stored_ordinal = NO_DATE
+        self.uses_office_names = any(rule.uses_office_names for rule in rules)
+
+    def set_stored_date(self, date_text: str) -> None:
+        """Set the stored earliest date used by 'Earlier Than Stored' ('' = none yet)."""
+        try:
+            self.stored_ordinal = date_ordinal(date_text) if date_text else NO_DATE
+        except ValueError:
+            self.stored_ordinal = NO_DATE
+
+    def evaluate(self, observations: Iterable[Observation], refreshed_zips: Optional[Iterable[str]] = None,
+                 now: Optional[float] = None) -> List[Alert]:
+        """
+        Check every observation against every rule and return one Alert per rule that newly matched
+        (or whose matches held back by the cooldown are now due).
+        refreshed_zips: zips that were looked at this time (defaults to the zips in observations);
+        matches remembered for other zips are kept, so a skipped zip doesn't re-alert later.
+        """
+        observations = list(observations)
+        now = time.time() if now is None else now
+        today = date.today().toordinal()
+        stored = self.stored_ordinal
+        if refreshed_zips is None:
+            refreshed_zips = {obs.zip_code for obs in observations}
+        refreshed_zips = set(refreshed_zips)
+        still_listed = {(obs.zip_code, obs.ordinal, obs.office) for obs in observations}
+
+        alerts = []
+        for rule in self.rules:
+            match = rule.match
+            seen = rule.seen
+            pending = rule.pending
+            current: Dict[str, Set[tuple]] = {zip_code: set() for zip_code in refreshed_zips}
+            new = []
+
+            for obs in observations:
+                if match(obs, today, stored):
+                    key = (obs.ordinal, obs.office)
+                    current.setdefault(obs.zip_code, set()).add(key)
+                    if key not in seen.get(obs.zip_code, ()):
+                        new.append(obs)
+
+            # Pending slots that disappeared from a re-checked calendar can't be booked any more
+            for pending_key in list(pending):
+                if pending_key[0] in refreshed_zips and pending_key not in still_listed:
+                    del pending[pending_key]
+
+            cooling_down = (
+                rule.last_alert_at is not None
+                and now - rule.last_alert_at < rule.cooldown_seconds
+            )
+            if cooling_down:
+                for obs in new:
+                    pending[(obs.zip_code, obs.ordinal, obs.office)] = obs
+            elif new or pending:
+                candidates = new + [obs for obs in pending.values() if obs not in new]
+                best = min(candidates, key=lambda obs: obs.ordinal)
+                alerts.append(Alert(rule, best, len(candidates)))
+                rule.last_alert_at = now
+                pending.clear()
+
+            seen.update(current)
+
+        if observations:
+            self.stored_ordinal = min(stored, min(obs.ordinal for obs in observations))
+        return alerts
+
+
+def load_alert_engine() -> AlertEngine:
+    """Compile the configured rules into an engine."""
+    return AlertEngine(load_rules())
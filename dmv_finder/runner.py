@@ -0,0 +1,296 @@
+"""
+Scan loop: one cycle over all queued zip codes, run once or continuously.
+Imports the browser stack at module load, so the CLI only imports this
+module for commands that actually scan.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+from dmv_finder.artifacts import capture_failure
+from dmv_finder.config import DMV_URL
+from dmv_finder.core import create_driver, random_delay, handle_captcha_and_retry
+from dmv_finder.fingerprint import FingerprintCache, KIND_CALENDAR, KIND_OFFICE_LIST
+from dmv_finder.history import record_observation
+from dmv_finder.log import BANNER, CYCLE_BANNER, new_cycle_id, bind_zip
+from dmv_finder.parameters import read_parameters, update_parameters, recycle_zip_codes
+from dmv_finder.rules import AlertEngine, load_alert_engine, make_observation
+from dmv_finder.actions import (
+    perform_login, 
+    verify_office_page, 
+    search_office, 
+    fingerprint_office_list,
+    read_first_office_name,
+    select_first_office, 
+    fingerprint_calendar,
+    read_calendar_dates,
+    click_back_reset
+)
+from dmv_finder.notify import send_ntfy_notification
+
+log = logging.getLogger(__name__)
+
+
+def run_cycle(driver, engine: Optional[AlertEngine] = None, changes: Optional[FingerprintCache] = None,
+              dry_run: bool = False):
+    """
+    Run one cycle of checking all zip codes.
+    Pass the same engine / fingerprint cache every cycle to keep rule state and skip unchanged calendars.
+    dry_run: browse and read every calendar, but don't write parameters.md, history or change stats,
+    don't recycle zip codes and don't notify (used by the browser benchmark).
+    """
+    if engine is None:
+        engine = load_alert_engine()
+    if changes is None:
+        changes = FingerprintCache()
+
+    cycle_id = new_cycle_id()
+    log.info("🚗 DMV Appointment Finder - Starting Cycle %s...", cycle_id, extra=BANNER)
+    
+    # Read parameters
+    params = read_parameters()
+    
+    # Validate required parameters
+    if not params["permit_number"]:
+        log.error("❌ STOP: Permit Number is missing in parameters.md!")
+        return False
+    if not params["dob"]:
+        log.error("❌ STOP: Date of Birth is missing in parameters.md!")
+        return False
+    if not params["zip_codes"]:
+        log.info("ℹ No zip codes to check. Recycling will happen at end of cycle.")
+        # Don't return, let recycle happen
+    
+    log.info("📋 Parameters loaded:")
+    log.debug("   Permit: %s", params['permit_number'])
+    log.debug("   DOB: %s", params['dob'])
+    log.info("   Zip Codes: %s", params['zip_codes'])
+    log.info("   Current Earliest: %s (%s)", params['earliest_date'], params['earliest_zip'])
+    
+    zip_codes_to_process = list(params["zip_codes"])
+    engine.set_stored_date(params["earliest_date"])
+    
+    if not zip_codes_to_process:
+        log.warning("⚠ No zip codes to process in this cycle.")
+        if dry_run:
+            return True
+        recycle_zip_codes()
+        log.info("✅ Zip codes recycled for next cycle.")
+        return True
+
+    log.info("\n🎯 Will check %s zip codes: %s", len(zip_codes_to_process), zip_codes_to_process)
+    
+    stored_date = params["earliest_date"]
+    stored_ordinal = engine.stored_ordinal
+    observations = []
+    observed_zips = set()
+    
+    try:
+        # Epic-2: Login
+        if not perform_login(driver, params):
+            log.error("❌ ALERT: Login failed! Will retry next cycle.")
+            return False
+        
+        # Epic-3: Verify office page
+        if not verify_office_page(driver):
+            log.error("❌ ALERT: Office verification failed! Will retry next cycle.")
+            return False
+        
+        # Check for CAPTCHA after login (wait and retry if needed)
+        if handle_captcha_and_retry(driver, DMV_URL):
+            log.error("❌ ALERT: CAPTCHA still blocking after retry! Will retry next cycle.")
+            return False
+        
+        # Process each zip code
+        for i, zip_code in enumerate(zip_codes_to_process):
+            with bind_zip(zip_code):
+                log.info("📍 Processing zip code %d/%d: %s", i + 1, len(zip_codes_to_process), zip_code, extra=BANNER)
+                
+                # Check for CAPTCHA before each zip code search (wait and retry if needed)
+                if handle_captcha_and_retry(driver, driver.current_url):
+                    log.error("❌ ALERT: CAPTCHA still blocking! Skipping this iteration.")
+                    continue  # Try next zip code
+                
+                # Epic-3: Search for office
+                if not search_office(driver, zip_code):
+                    continue
+                
+                # Update parameters - mark zip as checked (and remove from list)
+                if not dry_run:
+                    update_parameters(zip_checked=zip_code)
+                    log.info("  ✓ Zip code %s marked as checked & removed from list", zip_code)
+                
+                # Epic-4: Select first office (a changed result list may mean a different first office)
+                office_fingerprint = fingerprint_office_list(driver)
+                if not changes.is_unchanged(zip_code, KIND_OFFICE_LIST, office_fingerprint):
+                    changes.invalidate(zip_code, KIND_CALENDAR)
+                changes.commit(zip_code, KIND_OFFICE_LIST, office_fingerprint)
+                
+                office = read_first_office_name(driver) if engine.uses_office_names else ""
+                if not select_first_office(driver):
+                    continue
+                
+                # Epic-5: Read dates, unless the calendar is identical to the last visit.
+                # A skipped calendar still feeds its cached dates through the same checks below,
+                # so date-relative rules, cooldowns and a hand-edited stored date keep working.
+                # (rules are evaluated once for the whole cycle)
+                calendar_fingerprint = fingerprint_calendar(driver)
+                if changes.is_unchanged(zip_code, KIND_CALENDAR, calendar_fingerprint):
+                    zip_observations = changes.cached(zip_code, KIND_CALENDAR) or []
+                    calendar_ok = True
+                    log.info("  ⏭ Calendar unchanged since last visit (%s), reusing its dates", calendar_fingerprint)
+                else:
+                    slots, calendar_ok = read_calendar_dates(driver)
+                    zip_observations = [make_observation(slot, zip_code, office) for slot in slots]
+                    
+                    # Only a fully read calendar may be skipped next time, and only if it didn't change
+                    # while it was read (the first fingerprint may have caught it half-rendered)
+                    if calendar_ok:
+                        if fingerprint_calendar(driver) == calendar_fingerprint:
+                            changes.commit(zip_code, KIND_CALENDAR, calendar_fingerprint, zip_observations)
+                        else:
+                            log.info("  ↻ Calendar changed while it was read; it will be read in full next visit")
+                
+                if calendar_ok:
+                    observed_zips.add(zip_code)  # a failed read says nothing about which slots are gone
+                if zip_observations:
+                    observations.extend(zip_observations)
+                    log.info("  → %s open date(s) on this calendar", len(zip_observations))
+                    
+                    earliest = min(zip_observations, key=lambda obs: obs.ordinal)
+                    is_earlier = earliest.ordinal < stored_ordinal
+                    if not dry_run:
+                        record_observation(earliest.date, zip_code, is_earlier)
+                    
+                    if is_earlier:
+                        log.info("  🎉 NEW EARLIER DATE FOUND! %s < %s", earliest.date, stored_date)
+                        if not dry_run:
+                            update_parameters(new_date=earliest.date, new_zip=zip_code)
+                        stored_date = earliest.date
+                        stored_ordinal = earliest.ordinal
+                    else:
+                        log.info("  → Current date (%s) is still earliest", stored_date)
+                
+                # Epic-6: Go back for next zip code (unless last one)
+                if i < len(zip_codes_to_process) - 1:
+                    if not click_back_reset(driver):
+                        log.warning("⚠ Could not go back. Skipping remaining zip codes this cycle.")
+                        break  # Exit the zip code loop, will recycle and retry next cycle
+        
+        # Epic-6: Send a notification for every rule that newly matched
+        for alert in engine.evaluate(observations, observed_zips):
+            obs = alert.observation
+            log.info("🔔 Rule '%s' matched %s new slot(s), earliest %s (%s)", alert.rule.name, alert.new_matches, obs.date, obs.zip_code)
+            if dry_run:
+                log.info("  (dry run: notification not sent)")
+                continue
+            send_ntfy_notification(obs.date, obs.zip_code, "" if alert.rule.earlier_than_stored else alert.rule.name)
+        
+        log.info("🏁 DMV Appointment Finder - Cycle Complete!", extra=BANNER)
+        
+        # Final summary
+        final_params = read_parameters()
+        log.info("\n📊 Cycle Results:")
+        log.info("   Earliest Date: %s", final_params['earliest_date'])
+        log.info("   Earliest Zip: %s", final_params['earliest_zip'])
+        log.info("   Remaining Zips: %s", final_params['zip_codes'])
+        for kind, counts in changes.counters.items():
+            log.info("   %s: %s changed, %s unchanged, %s expired (since start)",
+                     kind, counts['changed'], counts['unchanged'], counts['expired'])
+        if dry_run:
+            log.info("ℹ Dry run: parameters, history and change stats left untouched.")
+            return True
+        changes.save_stats()
+        
+        # Recycle checked zip codes
+        log.info("\n♻️ Recycling checked zip codes...")
+        recycle_zip_codes()
+        log.info("✅ Zip codes recycled.")
+        
+        return True
+        
+    except Exception as e:
+        log.error("❌ Cycle error: %s", e)
+        capture_failure(driver, "cycle", e)
+        # Re-raise critical driver errors so main() can handle recreation
+        if "invalid session id" in str(e).lower() or "disconnected" in str(e).lower() or "session deleted" in str(e).lower():
+            raise e
+        return False
+
+
+def run_once() -> bool:
+    """Run a single cycle in a fresh browser, then close it."""
+    driver = create_driver()
+    try:
+        return run_cycle(driver, load_alert_engine())
+    finally:
+        driver.quit()
+        log.info("\n👋 Browser closed.")
+
+
+def run_forever() -> None:
+    """Main execution flow - runs continuously."""
+    log.info("🔄 Starting DMV Appointment Finder in CONTINUOUS MODE")
+    log.info("   Press Ctrl+C to stop.\n")
+    
+    driver = create_driver()
+    engine = load_alert_engine()  # compiled once; keeps cooldowns across cycles
+    changes = FingerprintCache()  # remembers calendars across cycles
+    cycle_count = 0
+    wait_minutes = 6
+    
+    try:
+        while True:
+            cycle_count += 1
+            log.info("# CYCLE %d", cycle_count, extra=CYCLE_BANNER)
+            
+            # Check if driver is alive
+            if driver is None:
+                log.info("🔄 Recreating browser session...")
+                driver = create_driver()
+
+            try:
+                success = run_cycle(driver, engine, changes)
+            except Exception as e:
+                log.error("❌ Critical error in cycle: %s", e)
+                # If it looks like a driver crash, kill it so we recreate next time
+                if "invalid session id" in str(e).lower() or "disconnected" in str(e).lower():
+                     log.error("💥 Browser session died. Will recreate next cycle.")
+                     try:
+                         driver.quit()
+                     except:
+                         pass
+                     driver = None
+                success = False
+            
+            if not success:
+                log.warning("⚠ Cycle had issues. Will retry after wait.")
+            
+            log.info("🕒 Time is %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            log.info("⏳ Waiting %s minutes before next cycle...", wait_minutes)
+            time.sleep(wait_minutes * 60)
+            
+            # Navigate back to start for next cycle
+            if driver:
+                log.info("🔄 Reloading for next cycle...")
+                try:
+                    driver.get(DMV_URL)
+                    random_delay(3, 5)
+                except Exception as e:
+                     log.warning("⚠ Could not reload page (%s). Killing driver to recreate next cycle.", e)
+                     try: 
+                         driver.quit()
+                     except: 
+                         pass
+                     driver = None
+            
+    except KeyboardInterrupt:
+        log.warning("\n\n🛑 Stopped by user (Ctrl+C)")
+    finally:
+        random_delay(2, 3)
+        if driver:
+            driver.quit()
+        log.info("\n👋 Browser closed. Goodbye!")
+
+
@@ -0,0 +1,94 @@
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from dmv_finder.artifacts import INDEX_NAME, SENSITIVE_INPUTS, ArtifactStore
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for capture(): records the calls made to it."""
+
+    def __init__(self, redact_fails: bool = False):
+        self.calls = []
+        self.redact_fails = redact_fails
+        self.current_url = "https://example.test/login"
+
+    def execute_script(self, script, *args):
+        self.calls.append(("execute_script", args))
+        if self.redact_fails:
+            raise RuntimeError("script failed")
+
+    @property
+    def page_source(self):
+        self.calls.append(("page_source",))
+        return "<html><input id='dlNumber'></html>"
+
+    def get_screenshot_as_png(self):
+        self.calls.append(("screenshot",))
+        return b"\x89PNG"
+
+    def get_log(self, kind):
+        return [{"message": "console"}]
+
+
+class ArtifactStoreTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def read_index(self):
+        return [json.loads(line) for line in (self.root / INDEX_NAME).read_text().splitlines()]
+
+    def test_inputs_blanked_before_capture(self):
+        store = ArtifactStore(self.root)
+        driver = FakeDriver()
+        store.capture(driver, "login")
+        store.flush()
+
+        self.assertEqual(driver.calls[0], ("execute_script", (list(SENSITIVE_INPUTS),)))
+        self.assertIn(("page_source",), driver.calls[1:])
+        entry = self.read_index()[0]
+        self.assertEqual(len(entry["files"]), 3)
+        html = gzip.decompress((self.root / entry["files"][0]).read_bytes()).decode()
+        self.assertIn("dlNumber", html)
+
+    def test_no_page_or_screenshot_when_redaction_fails(self):
+        store = ArtifactStore(self.root)
+        driver = FakeDriver(redact_fails=True)
+        store.capture(driver, "login")
+        store.flush()
+
+        self.assertNotIn(("page_source",), driver.calls)
+        self.assertNotIn(("screenshot",), driver.calls)
+        self.assertEqual([Path(f).suffixes for f in self.read_index()[0]["files"]], [[".console", ".json", ".gz"]])
+
+    def test_old_index_entries_pruned_even_without_files(self):
+        index = self.root / INDEX_NAME
+        old = {"captured_at": "2020-01-01T00:00:00", "cycle_id": "old", "zip_code": "-", "step": "cycle",
+               "error": None, "url": None, "files": []}
+        index.write_text(json.dumps(old) + "\n")
+
+        store = ArtifactStore(self.root, max_age_days=7)
+        store.capture(FakeDriver(redact_fails=True), "cycle")
+        store.flush()
+
+        self.assertEqual([entry["step"] for entry in self.read_index()], ["cycle"])
+        self.assertEqual(self.read_index()[0]["cycle_id"], "-")
+        self.assertEqual(sorted(p.name for p in self.root.iterdir() if p.is_file()), [INDEX_NAME])
+
+    def test_index_counts_against_size_cap(self):
+        store = ArtifactStore(self.root, max_bytes=600)
+        for _ in range(10):
+            store.capture(FakeDriver(redact_fails=True), "cycle")
+        store.flush()
+
+        total = sum(f.stat().st_size for f in self.root.rglob("*") if f.is_file())
+        self.assertLessEqual(total, 600)
+        self.assertTrue(self.read_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from dmv_finder.fingerprint import KIND_CALENDAR, FingerprintCache, read_change_stats
+
+
+class FingerprintCacheTests(unittest.TestCase):
+    def test_unchanged_until_fingerprint_differs(self):
+        cache = FingerprintCache()
+        self.assertFalse(cache.is_unchanged("95304", KIND_CALENDAR, "aaaa:3"))
+        cache.commit("95304", KIND_CALENDAR, "aaaa:3", ["obs"])
+        self.assertTrue(cache.is_unchanged("95304", KIND_CALENDAR, "aaaa:3"))
+        self.assertEqual(cache.cached("95304", KIND_CALENDAR), ["obs"])
+        self.assertFalse(cache.is_unchanged("95304", KIND_CALENDAR, "bbbb:3"))
+        self.assertFalse(cache.is_unchanged("95304", KIND_CALENDAR, None))
+        self.assertEqual(cache.counters[KIND_CALENDAR], {"unchanged": 1, "changed": 3, "expired": 0})
+
+    def test_fingerprint_expires(self):
+        cache = FingerprintCache(max_age_seconds=60)
+        with mock.patch("dmv_finder.fingerprint.time.monotonic", return_value=1000.0):
+            cache.commit("95304", KIND_CALENDAR, "aaaa:3", [])
+        with mock.patch("dmv_finder.fingerprint.time.monotonic", return_value=1059.0):
+            self.assertTrue(cache.is_unchanged("95304", KIND_CALENDAR, "aaaa:3"))
+        with mock.patch("dmv_finder.fingerprint.time.monotonic", return_value=1061.0):
+            self.assertFalse(cache.is_unchanged("95304", KIND_CALENDAR, "aaaa:3"))
+        self.assertEqual(cache.counters[KIND_CALENDAR]["expired"], 1)
+
+    def test_invalidate(self):
+        cache = FingerprintCache()
+        cache.commit("95304", KIND_CALENDAR, "aaaa:3", ["obs"])
+        cache.invalidate("95304", KIND_CALENDAR)
+        self.assertFalse(cache.is_unchanged("95304", KIND_CALENDAR, "aaaa:3"))
+        self.assertIsNone(cache.cached("95304", KIND_CALENDAR))
+
+
+class ChangeStatsTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.stats_file = Path(tmp.name) / "change_stats.json"
+        patcher = mock.patch("dmv_finder.fingerprint.CHANGE_STATS_FILE", self.stats_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_trip(self):
+        cache = FingerprintCache()
+        cache.is_unchanged("95304", KIND_CALENDAR, "aaaa:3")
+        cache.save_stats()
+        self.assertEqual(read_change_stats()[KIND_CALENDAR]["changed"], 1)
+        self.assertEqual([p.name for p in self.stats_file.parent.iterdir()], ["change_stats.json"])
+
+    def test_missing_or_partial_file_means_no_stats(self):
+        self.assertIsNone(read_change_stats())
+        self.stats_file.write_text('{"updated_at": "2026-')
+        self.assertIsNone(read_change_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
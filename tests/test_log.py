@@ -0,0 +1,44 @@
+import json
+import logging
+import queue
+import unittest
+
+from dmv_finder.log import BANNER, ConsoleFormatter, DeferredQueueHandler, JsonFormatter
+
+
+def record_through_queue(log_call, *args, **kwargs) -> logging.LogRecord:
+    """Log one record through a DeferredQueueHandler and return what the writer thread would get."""
+    records = queue.SimpleQueue()
+    logger = logging.getLogger("dmv_finder.tests.log")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = DeferredQueueHandler(records)
+    logger.addHandler(handler)
+    try:
+        getattr(logger, log_call)(*args, **kwargs)
+    finally:
+        logger.removeHandler(handler)
+    return records.get_nowait()
+
+
+class LogFormatTests(unittest.TestCase):
+    def test_traceback_kept_in_its_own_json_field(self):
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            record = record_through_queue("exception", "Cycle error: %s", "boom")
+
+        self.assertIsNotNone(record.exc_info)  # not formatted on the calling thread
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["msg"], "Cycle error: boom")
+        self.assertIn("ZeroDivisionError", entry["exc"])
+
+    def test_banner_only_framed_on_console(self):
+        record = record_through_queue("info", "Starting Cycle %s...", "abc", extra=BANNER)
+        self.assertEqual(json.loads(JsonFormatter().format(record))["msg"], "Starting Cycle abc...")
+        console = ConsoleFormatter("%(message)s").format(record)
+        self.assertEqual(console.strip().splitlines(), ["=" * 60, "Starting Cycle abc...", "=" * 60])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from dmv_finder.parsing import (
+    find_captcha_indicator,
+    normalize_text,
+    parse_calendar_html,
+    parse_calendar_slots_html,
+    parse_office_list_html,
+)
+
+CALENDAR_HTML = """
+<html><body>
+<div id="appointments__date-cal">
+  <span class="rbc-toolbar-label">November 2026</span>
+  <div class="rbc-row-content">
+    <div class="rbc-row">
+      <div class="rbc-row-segment">
+        <span class="rbc-event-day-num--mobile">November 2, 2026</span>
+        <span class="rbc-event-available">No Times</span>
+      </div>
+      <div class="rbc-row-segment">
+        <img src="x.png"><br>
+        <svg viewBox="0 0 1 1"><path d="M0 0"/></svg>
+        <div class="wrapper">
+          <div class="rbc-row-segment-inner">
+            <span class="rbc-event-day-num--mobile"> November 4, 2026 </span>
+          </div>
+          <span class="rbc-event-available">
+            Open Times
+          </span>
+          <span class="rbc-event-available">No Times</span>
+        </div>
+      </div>
+      <div class="rbc-row-segment">
+        <span class="rbc-event-available">Open Times</span>
+        <span class="rbc-event-day-num--mobile">Not a date</span>
+      </div>
+      <div class="rbc-row-segment">
+        <span class="rbc-event-day-num--mobile">November 9, 2026</span>
+        <span class="rbc-event-available">Nearby Office Times</span>
+      </div>
+    </div>
+  </div>
+</div>
+<span class="rbc-event-available">Open Times</span>
+<span class="rbc-event-day-num--mobile">November 1, 2026</span>
+</body></html>
+"""
+
+OFFICE_LIST_HTML = """
+<ul id="js-location-result-list">
+  <li>
+    <h3>Pleasanton
+        DMV</h3>
+    <ul><li>Wheelchair accessible</li></ul>
+    <input type="radio"> 6300 W Las Positas Blvd
+  </li>
+  <li><b>Tracy</b>&nbsp;DMV<br/>1350 Rosewood Ln</li>
+</ul>
+<ul><li>Not an office</li></ul>
+"""
+
+
+class CalendarParsingTests(unittest.TestCase):
+    def test_slots_are_read_from_segments_only(self):
+        self.assertEqual(parse_calendar_slots_html(CALENDAR_HTML), ["11/04/2026", "11/09/2026"])
+
+    def test_first_available_date(self):
+        self.assertEqual(parse_calendar_html(CALENDAR_HTML), "11/04/2026")
+
+    def test_no_open_slot(self):
+        html = '<div class="rbc-row-segment"><span class="rbc-event-available">No Times</span></div>'
+        self.assertEqual(parse_calendar_slots_html(html), [])
+        self.assertIsNone(parse_calendar_html(html))
+
+
+class OfficeListParsingTests(unittest.TestCase):
+    def test_direct_items_with_nested_lists_and_whitespace(self):
+        self.assertEqual(parse_office_list_html(OFFICE_LIST_HTML), [
+            "Pleasanton DMV Wheelchair accessible 6300 W Las Positas Blvd",
+            "Tracy DMV1350 Rosewood Ln",
+        ])
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text("  a\n\t b  c "), "a b c")
+
+
+class CaptchaTests(unittest.TestCase):
+    def test_active_and_solved(self):
+        self.assertEqual(find_captcha_indicator('<div class="rc-imageselect"></div>'), "rc-imageselect")
+        self.assertIsNone(find_captcha_indicator('<div class="rc-imageselect recaptcha-checkbox-checked">'))
+
+
+if __name__ == "__main__":
+    unittest.main()
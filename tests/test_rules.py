@@ -0,0 +1,140 @@
+import unittest
+from datetime import date, timedelta
+
+from dmv_finder.rules import AlertEngine, default_rules, make_observation, parse_rules
+
+
+def days_from_today(days: int) -> str:
+    return (date.today() + timedelta(days=days)).strftime("%m/%d/%Y")
+
+
+def engine_for(rules_md: str) -> AlertEngine:
+    return AlertEngine(parse_rules(rules_md))
+
+
+class ObservationTests(unittest.TestCase):
+    def test_weekday_matches_calendar(self):
+        self.assertEqual(make_observation("10/19/2026", "95304").weekday, 0)  # Monday
+        self.assertEqual(make_observation("10/25/2026", "95304").weekday, 6)  # Sunday
+
+
+class PredicateTests(unittest.TestCase):
+    def test_date_window_is_inclusive(self):
+        engine = engine_for("#### Rule: window\n- Date From: 11/01/2026\n- Date To: 11/30/2026\n")
+        observations = [make_observation(d, "95304") for d in ("10/31/2026", "11/01/2026", "11/30/2026", "12/01/2026")]
+        alerts = engine.evaluate(observations, now=0)
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0].observation.date, "11/01/2026")
+        self.assertEqual(alerts[0].new_matches, 2)
+
+    def test_excluded_weekdays(self):
+        engine = engine_for("#### Rule: weekdays\n- Excluded Weekdays: Sat, Sunday\n")
+        observations = [make_observation(d, "95304") for d in ("10/24/2026", "10/25/2026", "10/26/2026")]
+        alerts = engine.evaluate(observations, now=0)
+        self.assertEqual(alerts[0].observation.date, "10/26/2026")
+        self.assertEqual(alerts[0].new_matches, 1)
+
+    def test_within_days(self):
+        engine = engine_for("#### Rule: soon\n- Within Days: 14\n")
+        self.assertEqual(engine.evaluate([make_observation(days_from_today(15), "95304")], now=0), [])
+        alerts = engine.evaluate([make_observation(days_from_today(14), "94588")], now=0)
+        self.assertEqual(len(alerts), 1)
+
+    def test_offices_by_zip_and_name(self):
+        engine = engine_for("#### Rule: offices\n- Preferred Offices: 94588, tracy\n- Blocked Offices: Downtown\n")
+        observations = [
+            make_observation("11/02/2026", "94401", "San Mateo DMV"),
+            make_observation("11/03/2026", "95304", "Tracy Downtown DMV"),
+            make_observation("11/04/2026", "95304", "Tracy DMV"),
+            make_observation("11/05/2026", "94588", "Pleasanton DMV"),
+        ]
+        alerts = engine.evaluate(observations, now=0)
+        self.assertEqual(alerts[0].observation.date, "11/04/2026")
+        self.assertEqual(alerts[0].new_matches, 2)
+
+    def test_disabled_rules_are_skipped(self):
+        self.assertEqual(parse_rules("#### Rule: off\n- Enabled: no\n"), [])
+
+    def test_bad_values_skip_only_that_rule(self):
+        content = (
+            "#### Rule: typo\n- Within Days: two\n"
+            "#### Rule: bad date\n- Date From: 13/45/2026\n"
+            "#### Rule: bad weekday\n- Excluded Weekdays: Sat, Funday\n"
+            "#### Rule: fine\n- Within Days: 3\n"
+        )
+        with self.assertLogs("dmv_finder.rules", "ERROR") as logs:
+            rules = parse_rules(content)
+        self.assertEqual([rule.name for rule in rules], ["fine"])
+        self.assertIn("'typo'", logs.output[0])
+        self.assertIn("- Within Days: two", logs.output[0])
+        self.assertIn("- Excluded Weekdays: Sat, Funday", logs.output[2])
+
+
+class NewlyMatchesTests(unittest.TestCase):
+    def test_alerts_only_on_new_slots(self):
+        engine = engine_for("#### Rule: any\n")
+        first = [make_observation("11/02/2026", "95304")]
+        self.assertEqual(len(engine.evaluate(first, now=0)), 1)
+        self.assertEqual(engine.evaluate(first, now=1), [])
+        alerts = engine.evaluate(first + [make_observation("11/09/2026", "95304")], now=2)
+        self.assertEqual([a.observation.date for a in alerts], ["11/09/2026"])
+
+    def test_slot_that_disappears_and_returns_alerts_again(self):
+        engine = engine_for("#### Rule: any\n")
+        slot = [make_observation("11/02/2026", "95304")]
+        engine.evaluate(slot, now=0)
+        engine.evaluate([], refreshed_zips={"95304"}, now=1)
+        self.assertEqual(len(engine.evaluate(slot, now=2)), 1)
+
+    def test_unrefreshed_zip_keeps_its_matches(self):
+        engine = engine_for("#### Rule: any\n")
+        engine.evaluate([make_observation("11/02/2026", "95304")], now=0)
+        engine.evaluate([make_observation("11/09/2026", "94588")], now=1)
+        self.assertEqual(engine.evaluate([make_observation("11/02/2026", "95304")], now=2), [])
+
+    def test_earlier_than_stored_matches_old_behavior(self):
+        engine = AlertEngine(default_rules())
+        engine.set_stored_date("02/01/2027")
+        self.assertEqual(engine.evaluate([make_observation("03/01/2027", "95304")], now=0), [])
+        alerts = engine.evaluate([make_observation("01/20/2027", "95304")], now=1)
+        self.assertEqual(alerts[0].observation.date, "01/20/2027")
+        self.assertEqual(engine.stored_ordinal, make_observation("01/20/2027", "95304").ordinal)
+
+
+class CooldownTests(unittest.TestCase):
+    RULES = "#### Rule: earlier\n- Earlier Than Stored: yes\n- Cooldown Minutes: 60\n"
+
+    def test_held_back_match_alerts_when_cooldown_ends(self):
+        engine = engine_for(self.RULES)
+        engine.set_stored_date("02/01/2027")
+        self.assertEqual(len(engine.evaluate([make_observation("01/20/2027", "95304")], now=0)), 1)
+
+        # The runner saves 01/20 as the stored earliest before the next cycle
+        engine.set_stored_date("01/20/2027")
+        held = [make_observation("01/20/2027", "95304"), make_observation("01/10/2027", "95304")]
+        self.assertEqual(engine.evaluate(held, now=600), [])
+
+        # ...and then 01/10, so the slot no longer matches 'Earlier Than Stored' by itself
+        engine.set_stored_date("01/10/2027")
+        alerts = engine.evaluate(held, now=7200)
+        self.assertEqual([a.observation.date for a in alerts], ["01/10/2027"])
+        self.assertEqual(engine.evaluate(held, now=14400), [])
+
+    def test_pending_match_dropped_when_slot_disappears(self):
+        engine = engine_for(self.RULES)
+        engine.set_stored_date("02/01/2027")
+        engine.evaluate([make_observation("01/20/2027", "95304")], now=0)
+        engine.evaluate([make_observation("01/10/2027", "95304")], now=600)
+        self.assertEqual(engine.evaluate([], refreshed_zips={"95304"}, now=7200), [])
+
+    def test_pending_match_kept_while_zip_not_rechecked(self):
+        engine = engine_for(self.RULES)
+        engine.set_stored_date("02/01/2027")
+        engine.evaluate([make_observation("01/20/2027", "95304")], now=0)
+        engine.evaluate([make_observation("01/10/2027", "95304")], now=600)
+        alerts = engine.evaluate([], refreshed_zips=set(), now=7200)
+        self.assertEqual([a.observation.date for a in alerts], ["01/10/2027"])
+
+
+if __name__ == "__main__":
+    unittest.main()